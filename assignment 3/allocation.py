@@ -0,0 +1,109 @@
+"""
+Allocation of caves to the players of a multiplayer game, sharing caves between players.
+
+Every player who can afford the food offered buys it and mines one share of a cave, which is the
+food's hunger worth of material, or whatever is left of the cave. A cave holding more than one
+share can be mined by several players, each taking the next share. Players who cannot afford the
+food, or for whom every share left is a loss, stay home.
+
+Every player is offered the same food, so the players are interchangeable and a share is worth the
+same to whichever of them takes it. The most emeralds in total therefore come from handing out the
+best shares, one to each player who can afford the food, and stopping at the first share which
+would be a loss.
+
+Usage:
+```
+foods, balances, caves = allocate_players(game.players, game.get_caves(), food, game.material_index)
+```
+"""
+from __future__ import annotations
+
+from cave import Cave
+from food import Food
+from heap import IndexedMaxHeap
+from material_index import MaterialIndex
+from player import Player
+
+
+def cave_shares(caves: list[Cave], food: Food, material_index: MaterialIndex):
+    """
+    Yields [position, amount, count, last amount, price] for every cave whose material can be sold:
+    count shares of amount material each, then one share of the last amount, which is 0 when the
+    full shares empty the cave, all selling at the best price any trader offers
+
+    Complexity: O(C) where C is the number of caves
+    """
+    share = food.hunger_bars
+    for position in range(len(caves)):
+        cave = caves[position]
+        deal = material_index.best_deal(cave.material)
+        if deal is None or cave.quantity <= 0:
+            continue
+        full_amount = share / cave.material.mining_rate
+        full_shares = int(cave.quantity // full_amount)
+        yield [position, full_amount, full_shares, cave.quantity - full_shares * full_amount, deal[1]]
+
+
+def next_share(shares: list) -> float:
+    """
+    Returns the amount of material in the next share of a cave, or 0 once none are left
+
+    Complexity: O(1)
+    """
+    return shares[1] if shares[2] > 0 else shares[3]
+
+
+def live_shares(caves: list[Cave], food: Food, material_index: MaterialIndex) -> IndexedMaxHeap[list]:
+    """
+    Returns the cave_shares of the caves whose next share sells for more than the food costs, in an
+    IndexedMaxHeap by the emeralds that share sells for. Of caves with equal values, the one
+    listed first comes first.
+
+    Complexity: O(C) where C is the number of caves
+    """
+    entries = []
+    for shares in cave_shares(caves, food, material_index):
+        emeralds = next_share(shares) * shares[4]
+        if emeralds > food.price:
+            entries.append((shares, emeralds))
+    return IndexedMaxHeap.heapify(entries)
+
+
+def allocate_players(players: list[Player], caves: list[Cave], food: Food, material_index: MaterialIndex) -> tuple[list[Food|None], list[float], list[tuple[Cave, float]|None]]:
+    """
+    Shares the caves out among the players so that they make the most emeralds in total, each
+    player buying the food only if they can afford it, and returns the same lists as
+    MultiplayerGame.select_for_players. A cave may appear for several players, who between them
+    mine no more than it holds.
+
+    The players who can afford the food take the best share left, in the order they are listed,
+    until the players or the profitable shares run out. Each cave stays in the heap at the value
+    of its next share, which drops to its last share's value once its full shares are taken.
+
+    Complexity: O(C + P log C) where C is the number of caves and P the number of players
+    """
+    heap = live_shares(caves, food, material_index)
+    food_return = [None] * len(players)
+    em_return = [player.balance for player in players]
+    caves_return = [None] * len(players)
+    for index in range(len(players)):
+        if len(heap) == 0:
+            break
+        if players[index].balance < food.price:
+            continue
+        handle = heap.peek()
+        shares = heap.element(handle)
+        food_return[index] = food
+        em_return[index] = players[index].balance - food.price + heap.priority(handle)
+        caves_return[index] = (caves[shares[0]], next_share(shares))
+
+        if shares[2] > 0:
+            shares[2] -= 1
+        else:
+            shares[3] = 0
+        emeralds = next_share(shares) * shares[4]
+        if emeralds > food.price:
+            heap.update(handle, emeralds)
+        else:
+            heap.remove(handle)
+    return (food_return, em_return, caves_return)
@@ -35,6 +35,26 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             return current.height
         return 0
 
+    def get_size(self, current: AVLTreeNode) -> int:
+        """
+            Get the number of nodes in the sub-tree of a node. Return
+            current.size if current is not None. Otherwise, return 0.
+            :complexity: O(1)
+        """
+
+        if current is not None:
+            return current.size
+        return 0
+
+    def update(self, current: AVLTreeNode) -> None:
+        """
+            Recomputes the height and size of a node from its children.
+            :complexity: O(1)
+        """
+
+        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
+        current.size = self.get_size(current.left) + self.get_size(current.right) + 1
+
     def get_balance(self, current: AVLTreeNode) -> int:
         """
             Compute the balance factor for the current sub-tree as the value
@@ -49,63 +69,103 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
     def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
         """
             Attempts to insert an item into the tree, it uses the Key to insert it
+            Walks down iteratively keeping the path in a stack, then rebalances
+            back up the path. Returns the new root of the subtree.
+            :complexity: O(CompK * log(N)) where N is the number of nodes
         """
 
-        if current is None:  # base case: at the leaf
-            current = AVLTreeNode(key, item)
-            self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-            if current.height < current.left.height+1:
-                current.height = current.left.height+1
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-            if current.height < current.right.height+1:
-                current.height = current.right.height+1
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
-
-        current = self.rebalance(current)
-
-        return current
-
-
+        path = []
+        node = current
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key:
+                path.append(node)
+                node = node.right
+            else:  # key == node.key
+                raise ValueError('Inserting duplicate item')
+
+        node = AVLTreeNode(key, item)
+        self.length += 1
+        if len(path) == 0:
+            return node
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        return self.rebalance_path(path)
 
     def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
         """
             Attempts to delete an item from the tree, it uses the Key to
-            determine the node to delete.
+            determine the node to delete. Deleting a key which is not in the tree does nothing.
+            Walks down iteratively keeping the path in a stack, then rebalances
+            back up the path. Returns the new root of the subtree.
+            :complexity: O(CompK * log(N)) where N is the number of nodes
         """
 
-        if current is None:  # key not found
+        path = []
+        node = current
+        while node is not None and key != node.key:
+            path.append(node)
+            node = node.left if key < node.key else node.right
+        if node is None:  # key not found
             return current
 
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
-
-            self.rebalance(current)
+        if node.left is not None and node.right is not None:
+            # general case => move the successor up, and remove it from the right subtree instead
+            path.append(node)
+            succ = node.right
+            while succ.left is not None:
+                path.append(succ)
+                succ = succ.left
+            node.key = succ.key
+            node.item = succ.item
+            node = succ
+
+        child = node.left if node.left is not None else node.right
+        self.length -= 1
+        if len(path) == 0:
+            return child
+        parent = path[-1]
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        return self.rebalance_path(path)
+
+    def rebalance_path(self, path: List[AVLTreeNode]) -> AVLTreeNode:
+        """
+            Updates the heights and sizes of the nodes on a path from the root
+            of a subtree downwards, and rebalances them, starting from the bottom.
+            Once a node keeps its height without a rotation nothing above it
+            needs rebalancing, so only the sizes are updated from there.
+            Returns the new root of the subtree.
+            :complexity: O(log(N)) where N is the number of nodes
+        """
 
-        return current
+        settled = False
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            if settled:
+                node.size = self.get_size(node.left) + self.get_size(node.right) + 1
+                continue
+            height = node.height
+            self.update(node)
+            subtree = self.rebalance(node)
+            if i == 0:
+                return subtree
+            if subtree is not node:
+                parent = path[i - 1]
+                if parent.left is node:
+                    parent.left = subtree
+                else:
+                    parent.right = subtree
+            elif node.height == height:
+                settled = True
+        return path[0]
 
     def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
         """
@@ -129,9 +189,8 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         right_child.left = current
 
-        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
-
-        right_child.height = max(self.get_height(right_child.left), self.get_height(right_child.right)) + 1        
+        self.update(current)
+        self.update(right_child)
 
         return right_child
 
@@ -157,9 +216,8 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         left_child.right = current
 
-        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
-
-        left_child.height = max(self.get_height(left_child.left), self.get_height(left_child.right)) + 1
+        self.update(current)
+        self.update(left_child)
 
         return left_child
 
@@ -188,16 +246,273 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         return current
 
+    def kth(self, k: int) -> I:
+        """
+            Returns the item with the kth smallest key, counting from 0.
+            :raises IndexError: if k is not between 0 and len(self) - 1
+            :complexity: O(log(N)) where N is the number of nodes
+        """
+
+        if k < 0 or k >= self.length:
+            raise IndexError('Index out of range: {0}'.format(k))
+        current = self.root
+        while True:
+            left_size = self.get_size(current.left)
+            if k < left_size:
+                current = current.left
+            elif k == left_size:
+                return current.item
+            else:
+                k -= left_size + 1
+                current = current.right
+
+    def rank(self, key: K) -> int:
+        """
+            Returns the number of keys in the tree smaller than the given key,
+            which is the index of the key if it is in the tree.
+            :complexity: O(CompK * log(N)) where N is the number of nodes
+        """
+
+        result = 0
+        current = self.root
+        while current is not None:
+            if key <= current.key:
+                current = current.left
+            else:
+                result += self.get_size(current.left) + 1
+                current = current.right
+        return result
+
     def range_between(self, i: int, j: int) -> List:
         """
-        Returns a sorted list of all elements in the tree between the ith and jth indices, inclusive.
-        
+        Returns a sorted list of all keys in the tree between the ith and jth indices, inclusive.
+        Indices beyond the tree are dropped, as when slicing a list.
+
+        : complexity 𝐎(𝑗 − 𝑖 + log(𝑁))
+
+        """
+
+        return [node.key for node in self.nodes_between(i, j)]
+
+    def items_between(self, i: int, j: int) -> List:
+        """
+        Returns the items of the keys range_between(i, j) returns, in the same order.
+
         : complexity 𝐎(𝑗 − 𝑖 + log(𝑁))
 
         """
 
-        list = self.treesort()
+        return [node.item for node in self.nodes_between(i, j)]
+
+    def nodes_between(self, i: int, j: int) -> List:
+        """
+        Returns the nodes between the ith and jth indices, inclusive, in order of key.
+        Walks down to the ith node keeping a stack of the nodes still to visit,
+        then continues the in-order traversal from there for j - i steps.
+
+        : complexity 𝐎(𝑗 − 𝑖 + log(𝑁))
+
+        """
+
+        i = max(i, 0)
+        j = min(j, self.length - 1)
+        result = []
+        if i > j:
+            return result
+
+        stack = []
+        current = self.root
+        k = i
+        while True:
+            left_size = self.get_size(current.left)
+            if k < left_size:
+                stack.append(current)
+                current = current.left
+            elif k == left_size:
+                stack.append(current)
+                break
+            else:
+                k -= left_size + 1
+                current = current.right
+
+        for _ in range(j - i + 1):
+            current = stack.pop()
+            result.append(current)
+            current = current.right
+            while current is not None:
+                stack.append(current)
+                current = current.left
+        return result
+
+    @classmethod
+    def from_sorted(cls, items: List) -> 'AVLTree':
+        """
+            Builds a perfectly balanced tree from a list of (key, item) pairs
+            in strictly increasing order of key, without any comparisons
+            or rotations beyond checking the order.
+            :raises ValueError: if the keys are not strictly increasing
+            :complexity: O(N) where N is the number of items
+        """
+
+        for i in range(1, len(items)):
+            if not items[i - 1][0] < items[i][0]:
+                raise ValueError('Keys must be strictly increasing: {0}'.format(items[i][0]))
+        tree = cls()
+        tree.root = tree.build_aux(items, 0, len(items))
+        tree.length = len(items)
+        return tree
+
+    def build_aux(self, items: List, lo: int, hi: int) -> AVLTreeNode:
+        """
+            Builds a balanced subtree from items[lo:hi], rooted at the middle
+            item. Recurses no deeper than the height of the tree built.
+            :complexity: O(hi - lo)
+        """
+
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        current = AVLTreeNode(items[mid][0], items[mid][1])
+        current.left = self.build_aux(items, lo, mid)
+        current.right = self.build_aux(items, mid + 1, hi)
+        self.update(current)
+        return current
 
-        list = list[i: j + 1]
+    def join_aux(self, left: AVLTreeNode, current: AVLTreeNode, right: AVLTreeNode) -> AVLTreeNode:
+        """
+            Joins two subtrees with a node between them, where every key in left
+            is smaller than current.key and every key in right is larger.
+            The shorter subtree is hung from the spine of the taller one where
+            the heights meet, and the spine is rebalanced back up.
+            Returns the root of the joined subtree.
+            :complexity: O(|height(left) - height(right)| + 1)
+        """
+
+        left_height = self.get_height(left)
+        right_height = self.get_height(right)
+        path = []
+        if left_height > right_height + 1:
+            spine = left
+            while self.get_height(spine) > right_height + 1:
+                path.append(spine)
+                spine = spine.right
+            current.left = spine
+            current.right = right
+            self.update(current)
+            path[-1].right = current
+        elif right_height > left_height + 1:
+            spine = right
+            while self.get_height(spine) > left_height + 1:
+                path.append(spine)
+                spine = spine.left
+            current.left = left
+            current.right = spine
+            self.update(current)
+            path[-1].left = current
+        else:
+            current.left = left
+            current.right = right
+            self.update(current)
+            return current
+        return self.rebalance_path(path)
+
+    def split_aux(self, current: AVLTreeNode, key: K) -> tuple:
+        """
+            Splits a subtree into the subtrees of the keys smaller and larger
+            than key, and the node holding key, or None.
+            Recurses no deeper than the height of the subtree.
+            :complexity: O(CompK * log(N)) where N is the number of nodes
+        """
+
+        if current is None:
+            return None, None, None
+        left = current.left
+        right = current.right
+        if key == current.key:
+            current.left = current.right = None
+            self.update(current)
+            return left, current, right
+        if key < current.key:
+            smaller, found, larger = self.split_aux(left, key)
+            return smaller, found, self.join_aux(larger, current, right)
+        smaller, found, larger = self.split_aux(right, key)
+        return self.join_aux(left, current, smaller), found, larger
+
+    def union_aux(self, first: AVLTreeNode, second: AVLTreeNode) -> AVLTreeNode:
+        """
+            Merges two subtrees into one, keeping the item of first for keys in both.
+            :complexity: O(m * log(n/m + 1)) where m and n are the sizes of the
+            smaller and larger subtree
+        """
+
+        if first is None:
+            return second
+        if second is None:
+            return first
+        smaller, _, larger = self.split_aux(second, first.key)
+        left = self.union_aux(first.left, smaller)
+        right = self.union_aux(first.right, larger)
+        return self.join_aux(left, first, right)
+
+    def with_root(self, root: AVLTreeNode) -> 'AVLTree':
+        """
+            Returns a new tree of this class holding the given subtree
+            :complexity: O(1)
+        """
+
+        tree = type(self)()
+        tree.root = root
+        tree.length = self.get_size(root)
+        return tree
+
+    def split(self, key: K) -> tuple:
+        """
+            Splits the tree into a tree of the keys smaller than key and a tree
+            of the keys larger or equal. The nodes are moved, so this tree is
+            left empty.
+            :complexity: O(CompK * log(N)) where N is the number of nodes
+        """
+
+        smaller, found, larger = self.split_aux(self.root, key)
+        if found is not None:
+            larger = self.join_aux(None, found, larger)
+        self.root = None
+        self.length = 0
+        return self.with_root(smaller), self.with_root(larger)
+
+    def join(self, other: 'AVLTree') -> 'AVLTree':
+        """
+            Returns a tree of the keys of both trees, when every key of this tree
+            is smaller than every key of other. The nodes are moved, so both trees
+            are left empty.
+            :raises ValueError: if the keys overlap
+            :complexity: O(CompK * log(N)) where N is the number of nodes
+        """
+
+        if self.root is None or other.root is None:
+            root = self.root if self.root is not None else other.root
+        else:
+            largest = self.root
+            while largest.right is not None:
+                largest = largest.right
+            smallest = self.get_minimal(other.root)
+            if not largest.key < smallest.key:
+                raise ValueError('Keys of the joined trees overlap')
+            _, middle, rest = other.split_aux(other.root, smallest.key)
+            root = self.join_aux(self.root, middle, rest)
+        self.root = other.root = None
+        self.length = other.length = 0
+        return self.with_root(root)
+
+    def union(self, other: 'AVLTree') -> 'AVLTree':
+        """
+            Returns a tree of the keys of both trees, with the item of this tree
+            for keys in both. The nodes are moved, so both trees are left empty.
+            :complexity: O(m * log(n/m + 1)) where m and n are the sizes of the
+            smaller and larger tree
+        """
 
-        return list
+        root = self.union_aux(self.root, other.root)
+        self.root = other.root = None
+        self.length = other.length = 0
+        return self.with_root(root)
@@ -0,0 +1,364 @@
+"""
+Benchmarks for the game on large seeded worlds.
+
+Run a single benchmark with `python benchmark.py <name>`, or all of them with `python benchmark.py`.
+"""
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+
+from allocation import allocate_players
+from avl import AVLTree
+from bst import BinarySearchTree
+from cave import Cave, CAVE_NAMES
+from cave_store import CaveStore
+from game import MultiplayerGame, SoloGame
+from heap import IndexedMaxHeap, MaxHeap, nlargest
+from food import Food
+from material import Material, RANDOM_MATERIAL_NAMES
+from open_addressing import PROBING_STRATEGIES
+from player import Player
+from random_gen import RandomGen
+from trader import RandomTrader, RangeTrader, HardTrader, TRADER_NAMES
+
+
+def build_world(seed: int, n_materials: int, n_caves: int, n_traders: int) -> tuple[list[Material], list[Cave], list]:
+    """
+    Builds a seeded world of the given size. Names are suffixed with a number so any size can be built.
+
+    Complexity: O(M + C + T * M) where M, C and T are the number of materials, caves and traders
+    """
+    RandomGen.set_seed(seed)
+    materials = [
+        Material(f"{RandomGen.random_choice(RANDOM_MATERIAL_NAMES)} {i}", RandomGen.randint(1, 30))
+        for i in range(n_materials)
+    ]
+    caves = [
+        Cave(f"{RandomGen.random_choice(CAVE_NAMES)} {i}", RandomGen.random_choice(materials), RandomGen.randint(1, 10))
+        for i in range(n_caves)
+    ]
+    traders = []
+    for i in range(n_traders):
+        trader = RandomGen.random_choice([RandomTrader, RangeTrader, HardTrader])(f"{RandomGen.random_choice(TRADER_NAMES)} {i}")
+        trader.set_all_materials([material for material in materials if RandomGen.random_chance(0.5)])
+        trader.generate_deal()
+        traders.append(trader)
+    return materials, caves, traders
+
+
+def timed(function, *args) -> tuple[float, object]:
+    """ Returns the wall time taken by function(*args), and its result. """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_select_food_and_caves(seed: int = 1234) -> None:
+    """ Times every Player selection strategy on the same seeded world, and checks their answers agree. """
+    for n_materials, n_caves, n_traders in [(50, 1000, 100), (200, 10000, 1000)]:
+        materials, caves, traders = build_world(seed, n_materials, n_caves, n_traders)
+        player = Player("Steve", 50)
+        player.set_materials(materials)
+        player.set_caves(caves)
+        player.set_traders(traders)
+        player.set_foods([Food.random_food() for _ in range(5)])
+        print(f"select_food_and_caves: {n_materials} materials, {n_caves} caves, {n_traders} traders")
+        for strategy in [Player.STRATEGY_SORT, Player.STRATEGY_HEAP, Player.STRATEGY_PREFIX]:
+            elapsed, (food, balance, _) = timed(player.select_food_and_caves, strategy)
+            print(f"\t{strategy:>6}: {elapsed:.4f}s balance={balance:.4f} food={food}")
+
+
+def bench_many_foods(seed: int = 1234) -> None:
+    """ Compares the heap and prefix sum strategies when many foods are offered against many caves. """
+    materials, caves, traders = build_world(seed, 500, 100000, 200)
+    player = Player("Alex", 10000)
+    player.set_materials(materials)
+    player.set_caves(caves)
+    player.set_traders(traders)
+    player.set_foods([Food(f"Food {i}", RandomGen.randint(1, 5000), RandomGen.randint(1, 30)) for i in range(10000)])
+    print("select_food_and_caves: 10000 foods, 100000 caves")
+    for strategy in [Player.STRATEGY_HEAP, Player.STRATEGY_PREFIX]:
+        elapsed, (food, balance, _) = timed(player.select_food_and_caves, strategy)
+        print(f"\t{strategy:>6}: {elapsed:.4f}s balance={balance:.4f} food={food}")
+
+
+class DictMaterial(Material):
+    """ Material with a dictionary for its attributes, as every Material had before slots. """
+
+
+class DictCave(Cave):
+    """ Cave with a dictionary for its attributes, as every Cave had before slots. """
+
+
+class DictFood(Food):
+    """ Food with a dictionary for its attributes, as every Food had before slots. """
+
+
+def traced(function, *args) -> tuple[int, object]:
+    """ Returns the bytes still allocated by function(*args) once it returns, and its result. """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = function(*args)
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return used, result
+
+
+def fill(records: list, make) -> None:
+    """ Replaces every record with make(i). """
+    for i in range(len(records)):
+        records[i] = make(i)
+
+
+def bench_memory(n: int = 20000) -> None:
+    """ Reports bytes per Material, Cave and Food with and without slots, and per cave of a world built from them. """
+    names = [f"{CAVE_NAMES[i % len(CAVE_NAMES)]} {i}" for i in range(n)]
+    print(f"memory: {n} of each record")
+    for label, (material_class, cave_class, food_class) in [("dict", (DictMaterial, DictCave, DictFood)), ("slots", (Material, Cave, Food))]:
+        material = material_class("Netherite Ingot", 20.95)
+        # the lists holding the records cost the same either way, so they are allocated up front
+        material_bytes, _ = traced(fill, [None] * n, lambda i: material_class(names[i], 20.95))
+        cave_bytes, _ = traced(fill, [None] * n, lambda i: cave_class(names[i], material, 5))
+        food_bytes, _ = traced(fill, [None] * n, lambda i: food_class(names[i], 20, 10))
+        caves = [cave_class(names[i], material, 5) for i in range(n)]
+        game = SoloGame(sink=None)
+        world_bytes, _ = traced(lambda: game.initialise_with_data([material], caves, [], ["Steve"], [50]))
+        print(f"\t{label:>5}: Material {material_bytes / n:.0f}B, Cave {cave_bytes / n:.0f}B, Food {food_bytes / n:.0f}B, world {(world_bytes + cave_bytes) / n:.0f}B per cave")
+    store_bytes, _ = traced(CaveStore().read_quantities, caves)
+    print(f"\tCaveStore: {store_bytes / n:.0f}B per cave while finish_day regenerates them")
+
+
+def fill_table(table, keys: list[str]) -> None:
+    """ Inserts every key into the table. """
+    for key in keys:
+        table[key] = key
+
+
+def probe_lookups(table, keys: list[str]) -> tuple[int, int]:
+    """ Looks up every key, and returns the slots probed past the home slots in total and at most. """
+    probe_total, probe_max = table.probe_total, table.probe_max
+    table.probe_total = table.probe_max = 0
+    for key in keys:
+        table[key]
+    result = (table.probe_total, table.probe_max)
+    table.probe_total, table.probe_max = probe_total, probe_max
+    return result
+
+
+def bench_probing(n: int = 100000) -> None:
+    """ Compares the probe lengths and lookup speed of every probing strategy, on game names and on large synthetic key sets. """
+    key_sets = [
+        ("CAVE_NAMES", CAVE_NAMES),
+        ("TRADER_NAMES", TRADER_NAMES),
+        (f"{n} numbered cave names", [f"{CAVE_NAMES[i % len(CAVE_NAMES)]} {i}" for i in range(n)]),
+        (f"{n} short keys", [str(i) for i in range(n)]),
+    ]
+    for label, keys in key_sets:
+        print(f"probing: {label}")
+        for strategy, table_class in PROBING_STRATEGIES.items():
+            table = table_class(10)
+            build_time, _ = timed(fill_table, table, keys)
+            conflicts, build_probes, build_max, rehashes = table.statistics()
+            lookup_time, (probe_total, probe_max) = timed(probe_lookups, table, keys)
+            print(f"\t{strategy:>10}: build {build_time:.4f}s ({conflicts} conflicts, {build_probes} probes, max {build_max}, {rehashes} rehashes)"
+                  f" lookup {len(keys) / lookup_time:,.0f}/s, {probe_total / len(keys):.2f} probes each, max {probe_max}")
+
+
+def insert_keys(tree, keys: list) -> None:
+    """ Inserts every key into the tree, as its own item. """
+    for key in keys:
+        tree[key] = key
+
+
+def insert_keys_with(tree, pairs: list) -> None:
+    """ Inserts every (key, item) pair into the tree. """
+    for key, item in pairs:
+        tree[key] = item
+
+
+def get_keys(tree, keys: list) -> None:
+    """ Looks up every key in the tree. """
+    for key in keys:
+        tree[key]
+
+
+def delete_keys(tree, keys: list) -> None:
+    """ Deletes every key from the tree. """
+    for key in keys:
+        del tree[key]
+
+
+def bench_trees(n: int = 1000000, n_degenerate: int = 10000) -> None:
+    """ Times AVL tree insertion, lookup and deletion of sorted and shuffled keys, and a plain BST degenerated by sorted keys. """
+    RandomGen.set_seed(1234)
+    shuffled = list(range(n))
+    for i in range(n - 1, 0, -1):
+        j = RandomGen.randint(0, i)
+        shuffled[i], shuffled[j] = shuffled[j], shuffled[i]
+    for label, keys in [("sorted", list(range(n))), ("shuffled", shuffled)]:
+        tree = AVLTree()
+        insert_time, _ = timed(insert_keys, tree, keys)
+        get_time, _ = timed(get_keys, tree, keys)
+        height = tree.root.height
+        stream_time, _ = timed(lambda: [pair for pair, _ in zip(tree.iter_from(n // 2), range(100))])
+        list_time, _ = timed(tree.inorder_traversal)
+        delete_time, _ = timed(delete_keys, tree, keys[::2])
+        print(f"AVLTree: {n} {label} keys, height {height}: insert {insert_time:.2f}s, get {get_time:.2f}s, delete half {delete_time:.2f}s,"
+              f" 100 items from the middle {stream_time:.5f}s, inorder traversal {list_time:.2f}s")
+    tree = BinarySearchTree()
+    insert_time, _ = timed(insert_keys, tree, list(range(n_degenerate)))
+    traversal_time, _ = timed(tree.inorder_traversal)
+    print(f"BinarySearchTree: {n_degenerate} sorted keys: insert {insert_time:.2f}s, inorder traversal {traversal_time:.4f}s")
+
+
+def bench_order_statistics(n: int = 1000000, queries: int = 1000) -> None:
+    """ Times kth, rank and items_between on an AVLTree of n materials keyed by mining rate, against slicing the inorder traversal. """
+    RandomGen.set_seed(1234)
+    tree = AVLTree()
+    build_time, _ = timed(insert_keys_with, tree, [((RandomGen.random_float() * 100, i), Material(f"Material {i}", i)) for i in range(n)])
+    starts = [RandomGen.randint(0, n - 11) for _ in range(queries)]
+    print(f"order statistics: AVLTree of {n} materials built in {build_time:.2f}s")
+    kth_time, _ = timed(lambda: [tree.kth(i) for i in starts])
+    rank_time, _ = timed(lambda: [tree.rank((RandomGen.random_float() * 100, 0)) for _ in starts])
+    range_time, ranges = timed(lambda: [tree.items_between(i, i + 9) for i in starts])
+    print(f"\t{queries} queries: kth {kth_time:.4f}s, rank {rank_time:.4f}s, items_between(i, i + 9) {range_time:.4f}s")
+    slice_time, sliced = timed(lambda: [tree.inorder_traversal()[i:i + 10] for i in starts[:5]])
+    print(f"\t5 queries slicing the inorder traversal: {slice_time:.4f}s")
+    assert sliced == ranges[:5]
+
+
+def bench_bulk_trees(n: int = 1000000) -> None:
+    """ Times building an AVLTree from sorted items against inserting them, and merging trees with union against inserting. """
+    items = [(i, i) for i in range(n)]
+    bulk_time, _ = timed(AVLTree.from_sorted, items)
+    insert_time, _ = timed(insert_keys_with, AVLTree(), items)
+    print(f"AVLTree of {n} sorted items: from_sorted {bulk_time:.2f}s, inserting {insert_time:.2f}s")
+    for small in [1000, n // 2]:
+        large_items = [(i, i) for i in range(0, 2 * n, 2)]
+        small_items = [(i, i) for i in range(1, 2 * n, 2 * n // small)]
+        large, other = AVLTree.from_sorted(large_items), AVLTree.from_sorted(small_items)
+        union_time, _ = timed(large.union, other)
+        insert_time, _ = timed(insert_keys_with, AVLTree.from_sorted(large_items), small_items)
+        print(f"\tmerging {len(small_items)} items into {n}: union {union_time:.2f}s, inserting {insert_time:.2f}s")
+
+
+def bench_top_caves(n: int = 1000000, k: int = 10) -> None:
+    """ Picks the k most profitable of n caves with nlargest, against heapify and adding every cave to a heap. """
+    RandomGen.set_seed(1234)
+    material = Material("Netherite Ingot", 20.95)
+    caves = [Cave(f"Cave {i}", material, RandomGen.randint(1, 1000) / 10) for i in range(n)]
+    profit = lambda cave: cave.quantity * cave.material.mining_rate
+
+    def add_all() -> list[Cave]:
+        heap = MaxHeap(key=profit)
+        for cave in caves:
+            heap.add(cave)
+        return [heap.get_max() for _ in range(k)]
+
+    def heapify_all() -> list[Cave]:
+        heap = MaxHeap.heapify(caves, key=profit)
+        return [heap.get_max() for _ in range(k)]
+
+    print(f"top {k} of {n} caves by profit")
+    expected = None
+    for label, pick in [("nlargest", lambda: nlargest(k, caves, key=profit)), ("heapify", heapify_all), ("add", add_all)]:
+        tracemalloc.start()
+        elapsed, top = timed(pick)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"\t{label:>8}: {elapsed:.2f}s, peak {peak / 2 ** 20:.1f}MiB")
+        profits = [profit(cave) for cave in top]
+        assert expected is None or profits == expected
+        expected = profits
+
+
+def bench_live_values(n: int = 20000, rounds: int = 100) -> None:
+    """
+    Repeatedly mines half of the most valuable cave, updating its value in an IndexedMaxHeap, against
+    rebuilding a heap of every cave's value each round.
+    """
+    RandomGen.set_seed(1234)
+    quantities = [RandomGen.randint(1, 1000) / 10 for _ in range(n)]
+
+    def indexed() -> list[int]:
+        remaining = quantities[:]
+        heap = IndexedMaxHeap()
+        for i in range(n):
+            heap.add(i, remaining[i])
+        taken = []
+        for _ in range(rounds):
+            handle = heap.peek()
+            taken.append(heap.element(handle))
+            remaining[handle] /= 2
+            heap.update(handle, remaining[handle])
+        return taken
+
+    def rebuilt() -> list[int]:
+        remaining = quantities[:]
+        taken = []
+        for _ in range(rounds):
+            _, i = MaxHeap.heapify((remaining[i], -i) for i in range(n)).get_max()
+            taken.append(-i)
+            remaining[-i] /= 2
+        return taken
+
+    indexed_time, indexed_taken = timed(indexed)
+    rebuilt_time, rebuilt_taken = timed(rebuilt)
+    assert indexed_taken == rebuilt_taken
+    print(f"{rounds} rounds of mining the best of {n} caves: IndexedMaxHeap.update {indexed_time:.3f}s, rebuilding the heap {rebuilt_time:.2f}s")
+
+
+def bench_select_for_players(seed: int = 1234) -> None:
+    """ Times MultiplayerGame.select_for_players and verify_output_and_update_quantities for large lobbies against many caves. """
+    for n_players, n_caves in [(100, 10000), (5000, 200000)]:
+        materials, caves, traders = build_world(seed, 200, n_caves, 500)
+        game = MultiplayerGame(sink=None)
+        build_time, _ = timed(game.initialise_with_data, materials, caves, traders, [f"Player {i}" for i in range(n_players)], [50] * n_players)
+        food = Food("Cooked Chicken Cuts", 100, 10)
+        elapsed, (foods, balances, selected) = timed(game.select_for_players, food)
+        taken = len([item for item in selected if item is not None])
+        verify_time, _ = timed(game.verify_output_and_update_quantities, foods, balances, selected)
+        print(f"select_for_players: {n_players} players, {n_caves} caves: {elapsed:.4f}s, {taken} caves taken, verified and updated in {verify_time:.4f}s (world built in {build_time:.2f}s)")
+
+
+def bench_allocation(seed: int = 1234) -> None:
+    """
+    Times the greedy and shared cave allocations of MultiplayerGame.select_for_players on large
+    lobbies, and compares the emeralds the players gain.
+    """
+    for n_players, n_caves in [(100, 10000), (10000, 200000)]:
+        materials, caves, traders = build_world(seed, 200, n_caves, 500)
+        balances = [RandomGen.randint(14, 40) for _ in range(n_players)]
+        game = MultiplayerGame(sink=None)
+        game.initialise_with_data(materials, caves, traders, [f"Player {i}" for i in range(n_players)], balances)
+        food = Food("Cooked Chicken Cuts", 10, 20)
+        greedy_time, greedy = timed(game.select_for_players, food)
+        shares_time, shares = timed(allocate_players, game.players, game.get_caves(), food, game.material_index)
+        buyers = [i for i in range(n_players) if balances[i] >= food.price]
+        greedy_gain = sum(greedy[1][i] - balances[i] for i in range(n_players))
+        shares_gain = sum(shares[1][i] - balances[i] for i in range(n_players))
+        visited = len(set(item[0].name for item in shares[2] if item is not None))
+        print(f"allocation: {n_players} players ({len(buyers)} can afford the food), {n_caves} caves: "
+              f"greedy {greedy_time:.3f}s gains {greedy_gain:.0f}, "
+              f"shares {shares_time:.3f}s gains {shares_gain:.0f} from {visited} caves")
+
+
+BENCHMARKS = {
+    "select": bench_select_food_and_caves,
+    "foods": bench_many_foods,
+    "memory": bench_memory,
+    "probing": bench_probing,
+    "trees": bench_trees,
+    "ranks": bench_order_statistics,
+    "bulk": bench_bulk_trees,
+    "top": bench_top_caves,
+    "live": bench_live_values,
+    "multiplayer": bench_select_for_players,
+    "allocation": bench_allocation,
+}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or list(BENCHMARKS):
+        BENCHMARKS[name]()
@@ -8,8 +8,7 @@ from __future__ import annotations
 __author__ = 'Brendon Taylor, modified by Alexey Ignatiev, further modified by Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
-from typing import TypeVar, Generic
-from linked_stack import LinkedStack
+from typing import TypeVar, Generic, Iterator
 from node import TreeNode
 import sys
 
@@ -22,13 +21,14 @@ T = TypeVar('T')
 
 class BSTInOrderIterator:
     """ In-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal, keeping the stack in a list so
+        nothing is allocated per node visited.
     """
 
     def __init__(self, root: TreeNode[K, I]) -> None:
         """ Iterator initialiser. """
 
-        self.stack = LinkedStack()
+        self.stack = []
         self.current = root
 
     def __iter__(self) -> BSTInOrderIterator:
@@ -42,10 +42,10 @@ class BSTInOrderIterator:
         """
 
         while self.current:
-            self.stack.push(self.current)
+            self.stack.append(self.current)
             self.current = self.current.left
 
-        if self.stack.is_empty():
+        if len(self.stack) == 0:
             raise StopIteration
 
         result = self.stack.pop()
@@ -94,6 +94,69 @@ class BinarySearchTree(Generic[K, I]):
         """ Create an in-order iterator. """
         return BSTInOrderIterator(self.root)
 
+    def iter_items(self, lo: K = None, hi: K = None, reverse: bool = False) -> Iterator[tuple[K, I]]:
+        """
+            Lazily yields the (key, item) pairs with lo <= key <= hi, in ascending
+            order of key, or descending if reverse. A bound of None leaves that
+            end open. Only the path to the next node is kept, in a list.
+            :complexity: O(CompK * D) to yield the first pair, where D is the depth
+            of the tree, then O(1) amortised per pair
+        """
+
+        stack = []
+        current = self.root
+        if not reverse:
+            # keep the nodes at or above lo whose left subtree comes first
+            while current is not None:
+                if lo is None or not current.key < lo:
+                    stack.append(current)
+                    current = current.left
+                else:
+                    current = current.right
+            while len(stack) > 0:
+                current = stack.pop()
+                if hi is not None and hi < current.key:
+                    return
+                yield current.key, current.item
+                current = current.right
+                while current is not None:
+                    stack.append(current)
+                    current = current.left
+        else:
+            while current is not None:
+                if hi is None or not hi < current.key:
+                    stack.append(current)
+                    current = current.right
+                else:
+                    current = current.left
+            while len(stack) > 0:
+                current = stack.pop()
+                if lo is not None and current.key < lo:
+                    return
+                yield current.key, current.item
+                current = current.left
+                while current is not None:
+                    stack.append(current)
+                    current = current.right
+
+    def iter_from(self, key: K, reverse: bool = False) -> Iterator[tuple[K, I]]:
+        """
+            Lazily yields the (key, item) pairs from the given key onwards: the
+            keys at least key in ascending order, or if reverse the keys at most
+            key in descending order. The key need not be in the tree.
+            :see: #iter_items(lo: K, hi: K, reverse: bool)
+        """
+
+        if reverse:
+            return self.iter_items(hi=key, reverse=True)
+        return self.iter_items(lo=key)
+
+    def __reversed__(self) -> Iterator[K]:
+        """ Lazily yields the keys in descending order. """
+
+        for key, _ in self.iter_items(reverse=True):
+            yield key
+
     def __getitem__(self, key: K) -> I:
         """
             Attempts to get an item in the tree, it uses the Key to attempt to find it
@@ -107,14 +170,20 @@ class BinarySearchTree(Generic[K, I]):
         return self.get_tree_node_by_key_aux(self.root, key)
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current
-        elif key < current.key:
-            return self.get_tree_node_by_key_aux(current.left, key)
-        else:  # key > current.key
-            return self.get_tree_node_by_key_aux(current.right, key)
+        """
+            Walks down from current to the node with the given key
+            :raises KeyError: if the key is not in the subtree
+            :complexity best: O(CompK) the key is at current
+            :complexity worst: O(CompK * D) where D is the depth of the subtree
+        """
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
 
     def __setitem__(self, key: K, item: I) -> None:
         self.root = self.insert_aux(self.root, key, item)
@@ -122,20 +191,31 @@ class BinarySearchTree(Generic[K, I]):
     def insert_aux(self, current: TreeNode, key: K, item: I) -> TreeNode:
         """
             Attempts to insert an item into the tree, it uses the Key to insert it
+            Walks down iteratively, so a degenerate tree cannot exceed the recursion limit.
+            Returns the root of the subtree, which only changes if it was empty.
             :complexity best: O(CompK) inserts the item at the root.
             :complexity worst: O(CompK * D) inserting at the bottom of the tree
             where D is the depth of the tree
             CompK is the complexity of comparing the keys
         """
-        if current is None:  # base case: at the leaf
-            current = TreeNode(key, item)
+        if current is None:  # empty subtree
             self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
+            return TreeNode(key, item)
+        node = current
+        while True:
+            if key < node.key:
+                if node.left is None:
+                    node.left = TreeNode(key, item)
+                    break
+                node = node.left
+            elif key > node.key:
+                if node.right is None:
+                    node.right = TreeNode(key, item)
+                    break
+                node = node.right
+            else:  # key == node.key
+                raise ValueError('Inserting duplicate item')
+        self.length += 1
         return current
 
     def __delitem__(self, key: K) -> None:
@@ -145,31 +225,37 @@ class BinarySearchTree(Generic[K, I]):
         """
             Attempts to delete an item from the tree, it uses the Key to
             determine the node to delete.
+            Walks down iteratively, and returns the new root of the subtree.
+            :raises ValueError: if the key is not in the subtree
+            :complexity: O(CompK * D) where D is the depth of the tree
         """
-
-        if current is None:  # key not found
+        parent = None
+        node = current
+        while node is not None and key != node.key:
+            parent = node
+            node = node.left if key < node.key else node.right
+        if node is None:  # key not found
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
 
+        if node.left is not None and node.right is not None:
+            # general case => move the successor up, and remove it from the right subtree instead
+            parent = node
+            succ = node.right
+            while succ.left is not None:
+                parent = succ
+                succ = succ.left
+            node.key = succ.key
+            node.item = succ.item
+            node = succ
+
+        child = node.left if node.left is not None else node.right
+        self.length -= 1
+        if parent is None:
+            return child
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
         return current
 
     def get_successor(self, current: TreeNode) -> TreeNode:
@@ -233,12 +319,18 @@ class BinarySearchTree(Generic[K, I]):
         return my_list
 
     def inorder_traversal_aux(self, current: TreeNode, cur_list: list[TreeNode[K, I]]):
-        """ All nodes are printed in a ascending valuie and visited once. The traversal recursively traverses left subtree, visits root and traverses right subtree. """
-        if current is None:
-            return
-        self.inorder_traversal_aux(current.left, cur_list)
-        cur_list.append(current.item)
-        self.inorder_traversal_aux(current.right, cur_list)
+        """ Appends the items of the subtree to cur_list in ascending order of key, visiting every node once.
+            Uses a stack of the nodes whose left subtree is being visited, rather than recursion.
+            :complexity: O(N) where N is the number of nodes in the subtree
+        """
+        stack = []
+        while current is not None or len(stack) > 0:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            cur_list.append(current.item)
+            current = current.right
 
     def treesort(input_list: list) -> list:
         """ Creates binary tree and performs inorder traversal to get values in sorted order"""
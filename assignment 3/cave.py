@@ -99,7 +99,10 @@ CAVE_NAMES = [
 ]
 
 class Cave:
-    
+
+    # a large world holds thousands of caves, so they do without a per-instance __dict__
+    __slots__ = ("name", "material", "quantity")
+
     def __init__(self, name: str, material: Material, quantity: int=0) -> None:
         """
         Initialises the constructor for Cave
@@ -0,0 +1,91 @@
+""" Batch regeneration of cave quantities, for updating every cave at once. """
+from __future__ import annotations
+
+from array import array
+
+from cave import Cave
+from random_gen import RandomGen
+
+
+class CaveStore:
+    """
+    Helper for the end of day rules of Game.finish_day. The Cave objects stay the source of truth:
+    their quantities are read into a float array, updated there in one batch, and written back.
+
+    attributes:
+        quantities: array of the quantity of each cave, as last read
+    """
+
+    DEPLETE_CHANCE = 0.2
+    REFILL_AMOUNT = 10
+
+    def __init__(self) -> None:
+        """
+        Creates a helper holding no quantities
+
+        Complexity: O(1)
+        """
+        self.quantities = array('d')
+
+    def __len__(self) -> int:
+        """
+        Returns the number of quantities held
+
+        Complexity: O(1)
+        """
+        return len(self.quantities)
+
+    def read_quantities(self, caves: list[Cave]) -> None:
+        """
+        Reads the quantity of every cave, in order
+
+        Complexity: O(C) where C is the number of caves
+        """
+        self.quantities = array('d', [cave.quantity for cave in caves])
+
+    def write_back(self, caves: list[Cave]) -> None:
+        """
+        Copies the quantities back into the caves they were read from
+
+        Complexity: O(C) where C is the number of caves
+        """
+        quantities = self.quantities
+        for i in range(len(caves)):
+            caves[i].quantity = quantities[i]
+
+    def finish_day(self) -> None:
+        """
+        Applies the end of day rules of Game.finish_day to every cave at once.
+
+        A cave with material left loses a random fraction of it with chance DEPLETE_CHANCE, otherwise
+        (or when it is empty) it gains up to REFILL_AMOUNT, and is then rounded to 2 decimal places.
+        The per cave loop draws a chance only for caves with material left, then one float for every
+        cave. Both counts are known before any cave changes, so all the draws are taken from RandomGen
+        in one bulk call, in the same order, and RandomGen is left exactly where the loop would leave it.
+
+        Complexity: O(C) where C is the number of caves
+        """
+        quantities = self.quantities
+        draws = len(quantities)
+        for quantity in quantities:
+            if quantity > 0:
+                draws += 1
+
+        stream = RandomGen.stream()
+        floats = stream.floats(draws)
+        RandomGen.set_seed(stream.seed)
+
+        chance = self.DEPLETE_CHANCE
+        refill = self.REFILL_AMOUNT
+        k = 0
+        for i in range(len(quantities)):
+            quantity = quantities[i]
+            if quantity > 0 and floats[k] < chance:
+                quantity = quantity - floats[k + 1] * quantity
+                k += 2
+            else:
+                if quantity > 0:
+                    k += 1
+                quantity = quantity + round(floats[k] * refill, 2)
+                k += 1
+            quantities[i] = round(quantity, 2)
@@ -91,7 +91,10 @@ FOOD_NAMES = [
 ]
 
 class Food:
-    
+
+    # new foods are offered every day, so each is kept small with fixed attributes
+    __slots__ = ("name", "hunger_bars", "price")
+
     def __init__(self, name: str, hunger_bars: int, price: int) -> None:
         """
         Initialises the constructor for Food
@@ -8,7 +8,42 @@ from cave import Cave
 from food import Food
 from random_gen import RandomGen
 from hash_table import LinearProbeTable
+from heap import nlargest
 from trader import HardTrader
+from material_index import MaterialIndex
+from cave_store import CaveStore
+from allocation import allocate_players
+
+EVENT_HEADINGS = {
+    "materials": "Materials:\n\t",
+    "caves": "Caves:\n\t",
+    "traders": "Traders:\n\t",
+    "players": "Players:\n\t",
+    "deals": "Traders Deals:\n\t",
+    "foods": "\nFoods:\n\t",
+    "table_alert": "Hash Table Alerts:\n\t",
+}
+
+ALLOCATION_GREEDY = "greedy"
+ALLOCATION_SHARES = "shares"
+
+def print_sink(event: str, payload) -> None:
+    """
+    The default event sink, which prints every event to stdout.
+
+    Inputs:
+        event: the name of the event, a key of EVENT_HEADINGS or "selection"
+        payload: a list of game objects, or for "selection" the (food, balance, caves) chosen
+
+    Returns: None
+
+    Complexity: O(N) where N is the length of the formatted payload
+    """
+    if event == "selection":
+        print(*payload)
+    else:
+        print(EVENT_HEADINGS[event], end="")
+        print("\n\t".join(map(str, payload)))
 
 class Game:
 
@@ -24,32 +59,49 @@ class Game:
     MIN_FOOD = 2
     MAX_FOOD = 5
 
+    # hash table class for materials, caves and traders, see open_addressing.PROBING_STRATEGIES
+    TABLE_CLASS = LinearProbeTable
+
     @abstractmethod
-    def __init__(self) -> None:
+    def __init__(self, sink=print_sink) -> None:
         """
-        Instantiate the variable tables used to store data about the game
+        Instantiate the variable tables used to store data about the game, and the index of caves and
+        deals by material which is shared with the players
+
+        Inputs:
+            sink: called as sink(event, payload) for everything the game reports, see print_sink.
+                  None runs the game headless, without building or formatting any output.
 
         Complexity: O(n) where n is the table size used
         """
+        self.sink = sink
 
-        self.caves_table = LinearProbeTable(10)
-        self.materials_table = LinearProbeTable(10)
-        self.traders_table = LinearProbeTable(10)
+        self.caves_table = self.TABLE_CLASS(10)
+        self.materials_table = self.TABLE_CLASS(10)
+        self.traders_table = self.TABLE_CLASS(10)
+        self.material_index = MaterialIndex()
+        self.cave_store = CaveStore()
+
+    def emit(self, event: str, payload) -> None:
+        """
+        Reports an event to the sink, if there is one
+
+        Complexity: O(1) plus the cost of the sink
+        """
+        if self.sink is not None:
+            self.sink(event, payload)
 
     def initialise_game(self) -> None:
         """Initialise all game objects: Materials, Caves, Traders."""
         N_MATERIALS = RandomGen.randint(self.MIN_MATERIALS, self.MAX_MATERIALS)
         self.generate_random_materials(N_MATERIALS)
-        print("Materials:\n\t", end="")
-        print("\n\t".join(map(str, self.get_materials())))
+        self.emit("materials", self.get_materials())
         N_CAVES = RandomGen.randint(self.MIN_CAVES, self.MAX_CAVES)
         self.generate_random_caves(N_CAVES)
-        print("Caves:\n\t", end="")
-        print("\n\t".join(map(str, self.get_caves())))
+        self.emit("caves", self.get_caves())
         N_TRADERS = RandomGen.randint(self.MIN_TRADERS, self.MAX_TRADERS)
         self.generate_random_traders(N_TRADERS)
-        print("Traders:\n\t", end="")
-        print("\n\t".join(map(str, self.get_traders())))
+        self.emit("traders", self.get_traders())
 
     def initialise_with_data(self, materials: list[Material], caves: list[Cave], traders: list[Trader]):
         self.set_materials(materials)
@@ -72,31 +124,33 @@ class Game:
 
     def set_caves(self, caves: list[Cave]) -> None:
         """
-        Adds cave objects to the hash table used to store them
+        Adds cave objects to the hash table used to store them, and re-indexes the caves by material
 
         Inputs: List of cave objects
 
         Returns: None
 
-        Complextity: O(N) where N is the number of items added
+        Complextity: O(N + C) where N is the number of items added and C the total number of caves
 
         """
         for item in caves:
             self.caves_table[item.name] = item
+        self.material_index.set_caves(self.get_caves())
 
     def set_traders(self, traders: list[Trader]) -> None:
         """
-        Adds trader objects to the hash table used to store them
+        Adds trader objects to the hash table used to store them, and re-indexes their current deals
 
         Inputs: List of trader objects
 
         Returns: None
 
-        Complextity: O(N) where N is the number of items added
+        Complextity: O(N + T) where N is the number of items added and T the total number of traders
 
         """
         for item in traders:
             self.traders_table[item.name] = item
+        self.material_index.update_deals(self.get_traders())
 
     def get_materials(self) -> list[Material]:
         """
@@ -106,17 +160,11 @@ class Game:
 
         Returns: List of material objects
 
-        Complextity: O(S) where S is the size of the hash table
+        Complextity: O(1) when the table has not changed since the last call, otherwise
+        O(S) where S is the size of the hash table. The list is shared and must not be modified.
 
         """
-        materials_list = []
-        for item in self.materials_table.table:
-            
-            if item != None:
-                materials_list.append(item[1])
-
-        
-        return materials_list
+        return self.materials_table.values()
 
     def get_caves(self) -> list[Cave]:
         """
@@ -126,14 +174,11 @@ class Game:
 
         Returns: List of cave objects
 
-        Complextity: O(S) where S is the size of the hash table
+        Complextity: O(1) when the table has not changed since the last call, otherwise
+        O(S) where S is the size of the hash table. The list is shared and must not be modified.
 
         """
-        caves_list = []
-        for item in self.caves_table.table:
-            if item != None:
-                caves_list.append(item[1])
-        return caves_list
+        return self.caves_table.values()
 
     def get_traders(self) -> list[Trader]:
         """
@@ -143,15 +188,11 @@ class Game:
 
         Returns: List of trader objects
 
-        Complextity: O(S) where S is the size of the hash table
+        Complextity: O(1) when the table has not changed since the last call, otherwise
+        O(S) where S is the size of the hash table. The list is shared and must not be modified.
 
         """
-
-        traders_list = []
-        for item in self.traders_table.table:
-            if item != None:
-                traders_list.append(item[1])
-        return traders_list
+        return self.traders_table.values()
 
     def generate_random_materials(self, amount):
         """
@@ -159,7 +200,7 @@ class Game:
         Generated materials must all have different names and different mining_rates.
         (You may have to call Material.random_material more than <amount> times.)
         """
-        table = LinearProbeTable(amount)
+        table = self.TABLE_CLASS(amount)
         
         while table.count < amount:
             material = Material.random_material()
@@ -174,13 +215,14 @@ class Game:
         (You may have to call Cave.random_cave more than <amount> times.)
         """
 
-        table = LinearProbeTable(amount)
+        table = self.TABLE_CLASS(amount)
         materials = self.get_materials()
         while table.count < amount:
             cave = Cave.random_cave(materials)
             table[cave.name] = cave
             
         self.caves_table = table
+        self.material_index.set_caves(self.get_caves())
 
     def generate_random_traders(self, amount):
         """
@@ -190,7 +232,7 @@ class Game:
         Generated traders must all have different names
         (You may have to call <TraderClass>.random_trader() more than <amount> times.)
         """
-        table = LinearProbeTable(amount)
+        table = self.TABLE_CLASS(amount)
         materials_list = self.get_materials()
         while table.count < amount:
             trader = HardTrader("jeff")
@@ -202,18 +244,40 @@ class Game:
             trader.set_all_materials(materials_to_include)
             table[trader.name] = trader
         self.traders_table = table
+        self.material_index.update_deals(self.get_traders())
+
+    def generate_deals(self) -> None:
+        """
+        Has every trader generate a new deal. The material index watches the traders, so it rebuilds
+        its deals the next time they are read.
+
+        Complexity: O(T * D) where T is the number of traders and D the cost of generating a deal
+        """
+        for trader in self.get_traders():
+            trader.generate_deal()
 
     def finish_day(self):
         """
         DO NOT CHANGE
         Affects test results.
-        """
-        for cave in self.get_caves():
+
+        Every cave, in get_caves() order, is updated by the rule:
             if cave.quantity > 0 and RandomGen.random_chance(0.2):
                 cave.remove_quantity(RandomGen.random_float() * cave.quantity)
             else:
                 cave.add_quantity(round(RandomGen.random_float() * 10, 2))
             cave.quantity = round(cave.quantity, 2)
+        The rule is applied to all caves in one batch by the cave store, which takes the same random
+        numbers in the same order, so the results are identical.
+
+        The material index holds these same cave objects, so it needs no update here.
+
+        Complexity: O(C) where C is the number of caves
+        """
+        caves = self.get_caves()
+        self.cave_store.read_quantities(caves)
+        self.cave_store.finish_day()
+        self.cave_store.write_back(caves)
 
 class SoloGame(Game):
 
@@ -223,6 +287,7 @@ class SoloGame(Game):
         self.player.set_materials(self.get_materials())
         self.player.set_caves(self.get_caves())
         self.player.set_traders(self.get_traders())
+        self.player.set_index(self.material_index)
 
     def initialise_with_data(self, materials: list[Material], caves: list[Cave], traders: list[Trader], player_names: list[int], emerald_info: list[float]):
         super().initialise_with_data(materials, caves, traders)
@@ -230,27 +295,26 @@ class SoloGame(Game):
         self.player.set_materials(self.get_materials())
         self.player.set_caves(self.get_caves())
         self.player.set_traders(self.get_traders())
+        self.player.set_index(self.material_index)
 
     def simulate_day(self):
         # 1. Traders make deals
-        for trader in self.get_traders():
-            trader.generate_deal()
+        self.generate_deals()
 
-        print("Traders Deals:\n\t", end="")
-        print("\n\t".join(map(str, self.get_traders())))
+        self.emit("deals", self.get_traders())
         # 2. Food is offered
         food_num = RandomGen.randint(self.MIN_FOOD, self.MAX_FOOD)
         foods = []
         for _ in range(food_num):
             foods.append(Food.random_food())
-        print("\nFoods:\n\t", end="")
-        print("\n\t".join(map(str, foods)))
+        self.emit("foods", foods)
         self.player.set_foods(foods)
         # 3. Select one food item to purchase
         food, balance, caves = self.player.select_food_and_caves()
-        print(food, balance, caves)
+        self.emit("selection", (food, balance, caves))
         # 4. Quantites for caves is updated, some more stuff is added.
         self.verify_output_and_update_quantities(food, balance, caves)
+        return (food, balance, caves)
 
     def verify_output_and_update_quantities(self, food: Food | None, balance: float, caves: list[tuple[Cave, float]]) -> None:
         """
@@ -263,7 +327,7 @@ class SoloGame(Game):
 
         Returns: None
 
-        Complextity: O(T * C) T = number of traders, C = number of caves visited
+        Complextity: O(C) C = number of caves visited
 
         """
 
@@ -276,11 +340,7 @@ class SoloGame(Game):
 
         #verify that materials can be sold
         for item in caves:
-            found_item = False
-            for trader in self.get_traders():
-                if trader.deal[0] == item[0].material:
-                    found_item = True
-            assert found_item, 'Material mined cannot be sold'
+            assert self.material_index.is_sellable(item[0].material), 'Material mined cannot be sold'
         
         #verify more or equal emeralds then the starting value
         assert self.player.balance <= balance, 'Finished with less emeralds then started with'
@@ -302,8 +362,11 @@ class MultiplayerGame(Game):
     MIN_PLAYERS = 2
     MAX_PLAYERS = 5
 
-    def __init__(self) -> None:
-        super().__init__()
+    # how select_for_players shares out the caves, ALLOCATION_GREEDY or ALLOCATION_SHARES
+    ALLOCATION = ALLOCATION_GREEDY
+
+    def __init__(self, sink=print_sink) -> None:
+        super().__init__(sink)
         self.players = []
 
     def initialise_game(self) -> None:
@@ -314,8 +377,8 @@ class MultiplayerGame(Game):
             player.set_materials(self.get_materials())
             player.set_caves(self.get_caves())
             player.set_traders(self.get_traders())
-        print("Players:\n\t", end="")
-        print("\n\t".join(map(str, self.players)))
+            player.set_index(self.material_index)
+        self.emit("players", self.players)
 
     def generate_random_players(self, amount) -> None:
         for _ in range(amount):
@@ -329,24 +392,23 @@ class MultiplayerGame(Game):
             self.players[-1].set_materials(self.get_materials())
             self.players[-1].set_caves(self.get_caves())
             self.players[-1].set_traders(self.get_traders())
-        print("Players:\n\t", end="")
-        print("\n\t".join(map(str, self.players)))
+            self.players[-1].set_index(self.material_index)
+        self.emit("players", self.players)
 
     def simulate_day(self):
         # 1. Traders make deals
-        for trader in self.get_traders():
-            trader.generate_deal()
+        self.generate_deals()
 
-        print("Traders Deals:\n\t", end="")
-        print("\n\t".join(map(str, self.get_traders())))
+        self.emit("deals", self.get_traders())
         # 2. Food is offered
         offered_food = Food.random_food()
-        print(f"\nFoods:\n\t{offered_food}")
+        self.emit("foods", [offered_food])
         # 3. Each player selects a cave - The game does this instead.
         foods, balances, caves = self.select_for_players(offered_food)
 
         # 4. Quantites for caves is updated, some more stuff is added.
         self.verify_output_and_update_quantities(foods, balances, caves)
+        return (foods, balances, caves)
 
     def select_for_players(self, food: Food) -> tuple[list[Food|None], list[float], list[tuple[Cave, float]|None]]:
         """
@@ -361,73 +423,44 @@ class MultiplayerGame(Game):
                 A list of floats
                 A list of tuples containing a cave object and a float
 
-        Complexity: O(C * T + P)
+        Complexity: O(C log P + P)
             C = Number of caves
-            T = Number of traders
             P = Number of players
 
         
         This algorithm finds the caves that have materials that can be sold to traders, then calculates
-        the net gain or loss from buying the available food and going to each cave. Then sorts the net
-        gains and each player takes the best cave that hasnt already been taken, unless its a loss to do
-        so then they dont go to any cave and dont buy any food.
+        the net gain or loss from buying the available food and going to each cave, using the best price
+        any trader offers from the material index. Only as many of the best caves as there are players
+        who can afford the food are kept, in a bounded heap, and each of those players takes the best
+        cave that hasnt already been taken, unless its a loss to do so then they dont go to any cave
+        and dont buy any food. Players who cannot afford the food stay home. Of caves with equal
+        value, the one listed later is taken first.
+
+        With ALLOCATION set to ALLOCATION_SHARES the caves are shared out by allocation.allocate_players
+        instead, which leaves out players who cannot afford the food and lets players share a cave.
         """
         hungerAvailable = food.hunger_bars
+        caves = self.players[0].caves_list
+        if self.ALLOCATION == ALLOCATION_SHARES:
+            return allocate_players(self.players, caves, food, self.material_index)
 
-        #find the items being bought by traders
-        items_sold = []
-        for trader in self.players[0].traders_list:
-            deal = trader.deal
-            if deal != None:
-                items_sold.append(deal)
-
-        #finds the items that can be sold and are in caves
-        for item in items_sold:
-            item_in = False
-            for cave in self.players[0].caves_list:
-                if item[0] == cave.material:
-                    item_in = True
-            if not item_in:
-                items_sold.remove(item)
-
-        #calculates the expected profit or loss from each cave
-        caves_with_value = []
-        for cave in self.players[0].caves_list:
-            mat_available = False
-            for item in items_sold:
-                if cave.material == item[0]:
-                    mat_available = True
-            if mat_available:
-                item_price = 0
-                for item in items_sold:
-                    if item[0] == cave.material and item[1] > item_price:
-                        item_price = item[1]
-                cave_value = min((hungerAvailable/cave.material.mining_rate),cave.quantity)*item_price - food.price
-                caves_with_value.append((cave,cave_value))
-        
-        #sorts the caves by their profit
-        n = len(caves_with_value)
-        for mark in range(1,n):
-            temp = caves_with_value[mark]
-            i = mark - 1
-            while i >= 0 and caves_with_value[i][1] > temp[1]:
-                caves_with_value[i+1] = caves_with_value[i]
-                i -= 1
-            caves_with_value[i+1] = temp
-        caves_with_value = caves_with_value[::-1]
-
+        buyers = len([player for player in self.players if player.balance >= food.price])
+        best_caves = nlargest(buyers, self.cave_values(caves, food))
 
         #selects the option for each player and adds it to the return tuple
         food_return = []
         em_return = []
         caves_return = []
+        next_cave = 0
         for index in range(len(self.players)):
             
-            if index < len(caves_with_value) and caves_with_value[index][1] > 0:
-                food_return.append(Food)
-                em_return.append(self.players[index].balance + caves_with_value[index][1])
-
-                caves_return.append((caves_with_value[index][0],min(hungerAvailable/caves_with_value[index][0].material.mining_rate,caves_with_value[index][0].quantity)))
+            if next_cave < len(best_caves) and self.players[index].balance >= food.price:
+                cave_value, cave_index = best_caves[next_cave]
+                next_cave += 1
+                cave = caves[cave_index]
+                food_return.append(food)
+                em_return.append(self.players[index].balance + cave_value)
+                caves_return.append((cave,min(hungerAvailable/cave.material.mining_rate,cave.quantity)))
             else:
                 food_return.append(None)
                 em_return.append(self.players[index].balance)
@@ -439,9 +472,30 @@ class MultiplayerGame(Game):
 
         
 
+    def cave_values(self, caves: list[Cave], food: Food):
+        """
+        Yields (profit, position) for every cave in the list whose material can be sold, and which
+        makes a profit after buying the food. The profit is for mining the cave with all the food's
+        hunger, or until it is empty, and selling to the trader offering the best price.
+
+        Inputs:
+            caves: list of caves
+            food: a food object
+
+        Complexity: O(C) where C is the number of caves
+        """
+        hungerAvailable = food.hunger_bars
+        for position in range(len(caves)):
+            cave = caves[position]
+            deal = self.material_index.best_deal(cave.material)
+            if deal != None:
+                cave_value = min((hungerAvailable/cave.material.mining_rate),cave.quantity)*deal[1] - food.price
+                if cave_value > 0:
+                    yield (cave_value, position)
+
     def verify_output_and_update_quantities(self, foods: list[Food | None], balances: list[float], caves: list[tuple[Cave, float]|None]) -> None:
         """
-        Verifies the outputs of select_for_players
+        Verifies the outputs of select_for_players, then mines the caves and sets each player's balance
 
         Inputs:
             A list of food objects of None
@@ -451,31 +505,58 @@ class MultiplayerGame(Game):
         Returns:
             None
 
-        Complexity: O(F * C)
-            F = number of foods
-            C = number of caves
+        Complexity: O(P)
+            P = number of players
 
+        Each material mined is looked up in the material index once, and the amounts taken from each
+        cave are totalled before any is compared to what the cave holds, so players sharing a cave
+        cannot mine more between them than it holds. Every player given food must be able to afford
+        it, and every balance must be the player's balance less the food's price, plus what the
+        material mined sells for at the best price. Nothing is updated unless every check passes.
         """
 
-
+        best_deals = {}
+        mined = {}
+        visited = []
         for index in range(len(foods)):
+            player = self.players[index]
+            expected = player.balance
+            if foods[index] != None:
+                #verify the player can afford the food
+                assert player.balance >= foods[index].price, 'Player cannot afford the food'
+                expected -= foods[index].price
+
+            item = caves[index]
+            if item != None:
+                cave, amount = item
+
+                #verify that materials can be sold
+                if cave.material.name not in best_deals:
+                    best_deals[cave.material.name] = self.material_index.best_deal(cave.material)
+                deal = best_deals[cave.material.name]
+                assert deal != None, 'Material mined cannot be sold'
+                expected += amount * deal[1]
+
+                if cave.name not in mined:
+                    mined[cave.name] = 0
+                    visited.append(cave)
+                mined[cave.name] += amount
 
-            #verify quantity of materials mined are possible
-            for item in caves:
-                if item != None:
-                    assert (item[0].quantity- item[1]) >= -0.0001, 'Player mined more then possible from a cave'
-
-            #verify that materials can be sold
-            for item in caves:
-                if item != None:
-                    found_item = False
-                    for trader in self.get_traders():
-                        if trader.deal[0] == item[0].material:
-                            found_item = True
-                    assert found_item, 'Material mined cannot be sold'
-            
             #verify more or equal emeralds then the starting value
-            assert self.players[index].balance <= balances[index], 'Finished with less emeralds then started with'
+            assert player.balance <= balances[index], 'Finished with less emeralds then started with'
+            #verify the balance is what the food and the material sold come to
+            assert abs(balances[index] - expected) <= 0.0001, 'Balance does not match the food bought and material sold'
+
+        #verify quantity of materials mined are possible
+        for cave in visited:
+            assert (cave.quantity - mined[cave.name]) >= -0.0001, 'Players mined more then possible from a cave'
+
+        #update quantities
+        for cave in visited:
+            cave.remove_quantity(mined[cave.name])
+
+        for index in range(len(balances)):
+            self.players[index].balance = balances[index]
 
 if __name__ == "__main__":
     game = MultiplayerGame()
@@ -3,36 +3,66 @@
 Defines a Hash Table using Linear Probing for conflict resolution.
 """
 from __future__ import annotations
-from hashlib import new
-from http.client import CONFLICT
 __author__ = 'Brendon Taylor. Modified by Graeme Gange, Alexey Ignatiev, and Jackson Goerner'
 __docformat__ = 'reStructuredText'
 __modified__ = '21/05/2020'
 __since__ = '14/05/2020'
 
 
+from functools import lru_cache
 from referential_array import ArrayR
 from typing import TypeVar, Generic
 from primes import LargestPrimeIterator
 T = TypeVar('T')
 
+HASH_BASE = 29
+HASH_CACHE_SIZE = 1 << 16
+
+# Marks the slot of a deleted entry, so probe chains running through it are not broken
+DELETED = object()
+
+
+@lru_cache(maxsize=HASH_CACHE_SIZE)
+def key_hash(key: str) -> int:
+    """
+        Hash a key independently of any table size, as the polynomial
+        sum(ord(key[i]) * 29**i). Reducing it modulo a tablesize gives exactly the
+        position the character by character hash used to compute, so tables keep
+        the same layout.
+        Recently used keys are cached, and each entry also stores its hash, so a key
+        is only hashed again when it falls out of the cache.
+        :complexity best: O(1) the key is cached
+        :complexity worst: O(K) where K is the length of the key
+    """
+    hashKey = 0
+    for char in reversed(key):
+        hashKey = hashKey * HASH_BASE + ord(char)
+    return hashKey
+
 
 
 class LinearProbeTable(Generic[T]):
     """
         Linear Probe Table.
 
+        Each slot of the table is None, DELETED, or a (key, value, key_hash(key)) tuple.
+
         attributes:
             count: number of elements in the hash table
+            deleted_count: number of slots holding DELETED
             table: used to represent our internal array
             tablesize: current size of the hash table
             conflict_count: the number of times an insertion of an element met a conflict
             probe_total: the total number of elements traversed by linear probing
             probe_max: the largest number of elements in a chain
             rehash_count: the number of times that the table has been rehashed
+            _keys_view: cached list of keys, or None when the table has changed since it was built
+            _values_view: cached list of values, or None when the table has changed since it was built
 
     """
 
+    COMPACT_RATIO = 0.25
+
     def __init__(self, expected_size: int, tablesize_override: int = -1) -> None:
         
         """
@@ -43,10 +73,13 @@ class LinearProbeTable(Generic[T]):
         """
 
         self.count = 0
+        self.deleted_count = 0
         self.conflict_count = 0
         self.probe_total = 0
         self.probe_max = 0
         self.rehash_count = 0
+        self._keys_view = None
+        self._values_view = None
 
         if tablesize_override == -1:
             self.primeIterator = LargestPrimeIterator(expected_size*3,3)
@@ -55,20 +88,30 @@ class LinearProbeTable(Generic[T]):
             self.primeIterator = LargestPrimeIterator(tablesize_override,3)
             self.tableSize = tablesize_override
         self.table = ArrayR(self.tableSize)
-           
-        
-        
+
+    @classmethod
+    def from_items(cls, items: list[tuple[str, T]]) -> LinearProbeTable[T]:
+        """
+            Builds a table holding every (key, data) pair, sized once for all of
+            them so no rehash happens while it is filled. Later pairs replace
+            earlier pairs with the same key.
+            :complexity: O(P + N) where P is the complexity of finding the tablesize
+                            and N the number of items, assuming short probe chains
+        """
+        table = cls(len(items))
+        for (key, data) in items:
+            table[key] = data
+        return table
+
 
     def hash(self, key: str) -> int:
         """
             Hash a key for insertion into the hashtable.
-            Complexity: O(N), where n is the length of the key
+            :see: #key_hash(key: str)
+            :complexity best: O(1) the key's hash is cached
+            :complexity worst: O(K) where K is the length of the key
         """
-        hashKey = 0
-        for index in range(len(key)):
-            hashKey += ord(key[index])*29**index
-            hashKey = hashKey % self.tableSize
-        return int(hashKey)
+        return key_hash(key) % self.tableSize
 
     def statistics(self) -> tuple:
         """
@@ -100,46 +143,75 @@ class LinearProbeTable(Generic[T]):
 
         chainStart = self.probe_total
         conflicted = False
+        deletedPosition = -1
         for _ in range(len(self.table)):  # start traversing
-            if self.table[position] is None:  # found empty slot
+            entry = self.table[position]
+            if entry is None:  # found empty slot
                 if is_insert:
                     self.probe_max=max(self.probe_max,self.probe_total - chainStart)
-                    return position
+                    # reuse the first deleted slot passed, the key is not further along
+                    return position if deletedPosition == -1 else deletedPosition
                 else:
                     raise KeyError(key)  # so the key is not in
-            elif self.table[position][0] == key:  # found key
+            elif entry is not DELETED and entry[0] == key:  # found key
                 self.probe_max=max(self.probe_max,self.probe_total - chainStart)
                 return position
             else:  # there is something but not the key, try next
+                if entry is DELETED and deletedPosition == -1:
+                    deletedPosition = position
                 if not conflicted:
                     self.conflict_count += 1
                     conflicted = True
                 position = (position + 1) % len(self.table)
                 self.probe_total += 1
 
+        if is_insert and deletedPosition != -1:
+            return deletedPosition
         raise KeyError(key)
 
     def keys(self) -> list[str]:
         """
-            Returns all keys in the hash table.
-            Complexity: O(N)
+            Returns all keys in the hash table, in table order.
+            The list is cached until the table next changes, so it must not be modified.
+            :complexity best: O(1) the table has not changed since the last call
+            :complexity worst: O(N) where N is the tablesize
         """
-        res = []
-        for x in range(len(self.table)):
-            if self.table[x] is not None:
-                res.append(self.table[x][0])
-        return res
+        if self._keys_view is None:
+            self._build_views()
+        return self._keys_view
 
     def values(self) -> list[T]:
         """
-            Returns all values in the hash table.
-            Complexity: O(N)
+            Returns all values in the hash table, in table order.
+            The list is cached until the table next changes, so it must not be modified.
+            :complexity best: O(1) the table has not changed since the last call
+            :complexity worst: O(N) where N is the tablesize
+        """
+        if self._values_view is None:
+            self._build_views()
+        return self._values_view
+
+    def _build_views(self) -> None:
+        """
+            Builds the cached key and value lists in a single pass over the table
+            :complexity: O(N) where N is the tablesize
+        """
+        keys = []
+        values = []
+        for item in self.table.array:
+            if item is not None and item is not DELETED:
+                keys.append(item[0])
+                values.append(item[1])
+        self._keys_view = keys
+        self._values_view = values
+
+    def _invalidate_views(self) -> None:
+        """
+            Drops the cached key and value lists after the table changes
+            :complexity: O(1)
         """
-        res = []
-        for x in range(len(self.table)):
-            if self.table[x] is not None:
-                res.append(self.table[x][1])
-        return res
+        self._keys_view = None
+        self._values_view = None
 
     def __contains__(self, key: str) -> bool:
         """
@@ -178,13 +250,38 @@ class LinearProbeTable(Generic[T]):
         """
         if self.count > 0.5*self.tableSize:
             self._rehash()
+        elif self.count + self.deleted_count > 0.5*self.tableSize:
+            self._compact()
 
         position = self._linear_probe(key, True)
 
         if self.table[position] is None:
             self.count += 1
+        elif self.table[position] is DELETED:
+            self.count += 1
+            self.deleted_count -= 1
+
+        self.table[position] = (key, data, key_hash(key))
+        self._invalidate_views()
 
-        self.table[position] = (key, data)
+    def __delitem__(self, key: str) -> None:
+        """
+            Deletes the entry for the key, leaving DELETED in its slot.
+            Once more than COMPACT_RATIO of the table is DELETED, the entries are
+            placed again at the same tablesize to clear them.
+            :see: #self._linear_probe(key: str, is_insert: bool)
+            :raises KeyError: when the key doesn't exist
+
+            Best case: O(1)
+            Worst case: O(N)
+        """
+        position = self._linear_probe(key, False)
+        self.table[position] = DELETED
+        self.count -= 1
+        self.deleted_count += 1
+        self._invalidate_views()
+        if self.deleted_count > self.COMPACT_RATIO*self.tableSize:
+            self._compact()
 
     def is_empty(self):
         """
@@ -213,23 +310,53 @@ class LinearProbeTable(Generic[T]):
     def _rehash(self) -> None:
         
         """
-            Method to rehash the table
+            Method to rehash the table.
+            Entries are placed using their stored hash, so no key is hashed or
+            compared again. The new tablesize is the size a LinearProbeTable
+            expecting the next prime would have, as it has always been.
 
             Complexity: O(N)
         """
 
-        newTable = LinearProbeTable(self.primeIterator.__next__())
-        for index in range(self.tableSize):
-            if self.table[index] != None:
-                (key,data) = self.table[index]
-                newTable[str(key)] = data
-        self.count = newTable.count
-        self.table = newTable.table
-        self.tableSize = newTable.tableSize
+        newSize = LargestPrimeIterator(self.primeIterator.__next__()*3,3).__next__()
+        self._place_entries(newSize)
         self.rehash_count += 1
-        self.conflict_count += newTable.conflict_count
-        self.probe_total += newTable.probe_total
-        self.probe_max = max(self.probe_max,newTable.probe_max)
+
+    def _compact(self) -> None:
+        """
+            Clears every DELETED slot by placing the entries again at the same tablesize.
+            No user operation asked for the entries to move, so the conflicts and
+            probes made placing them are left out of the statistics.
+
+            Complexity: O(N)
+        """
+        statistics = (self.conflict_count, self.probe_total, self.probe_max)
+        self._place_entries(self.tableSize)
+        self.conflict_count, self.probe_total, self.probe_max = statistics
+
+    def _place_entries(self, newSize: int) -> None:
+        """
+            Moves every entry into a new array of the given size, using the hash
+            stored with each entry.
+
+            Complexity: O(N)
+        """
+        newTable = ArrayR(newSize)
+        for entry in self.table.array:
+            if entry is not None and entry is not DELETED:
+                position = entry[2] % newSize
+                chainStart = self.probe_total
+                if newTable[position] is not None:
+                    self.conflict_count += 1
+                    while newTable[position] is not None:
+                        position = (position + 1) % newSize
+                        self.probe_total += 1
+                self.probe_max = max(self.probe_max,self.probe_total - chainStart)
+                newTable[position] = entry
+        self.table = newTable
+        self.tableSize = newSize
+        self.deleted_count = 0
+        self._invalidate_views()
         
 
 
@@ -242,8 +369,8 @@ class LinearProbeTable(Generic[T]):
         """
         result = ""
         for item in self.table:
-            if item is not None:
-                (key, value) = item
+            if item is not None and item is not DELETED:
+                (key, value, _) = item
                 result += "(" + str(key) + "," + str(value) + ")\n"
         return result
 
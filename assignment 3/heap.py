@@ -3,53 +3,101 @@ from __future__ import annotations
 __author__ = "Brendon Taylor, modified by Jackson Goerner"
 __docformat__ = 'reStructuredText'
 
-from typing import Generic
+from array import array
+from typing import Callable, Generic, Iterable
 from referential_array import ArrayR, T
 
 
 class MaxHeap(Generic[T]):
+    """
+    Binary heap with the largest element at the root.
+    The array grows as needed, so the max_size given is only the starting capacity.
+    With a key function elements are ordered by key(element), which is computed once per element
+    and kept in a second array alongside it.
+    """
     MIN_CAPACITY = 1
 
-    def __init__(self, max_size: int) -> None:
+    def __init__(self, max_size: int = MIN_CAPACITY, key: Callable[[T], object] = None) -> None:
         self.length = 0
+        self.key = key
         self.the_array = ArrayR(max(self.MIN_CAPACITY, max_size) + 1)
+        self.the_keys = ArrayR(len(self.the_array))
+
+    @classmethod
+    def heapify(cls, iterable: Iterable[T], key: Callable[[T], object] = None) -> MaxHeap[T]:
+        """
+        Builds a heap holding every element, sinking from the last parent up to the root
+        :complexity: O(N) where N is the number of elements
+        """
+        elements = list(iterable)
+        heap = cls(len(elements), key)
+        for i in range(len(elements)):
+            heap.the_array[i + 1] = elements[i]
+            heap.the_keys[i + 1] = elements[i] if key is None else key(elements[i])
+        heap.length = len(elements)
+        for k in range(heap.length // 2, 0, -1):
+            heap.sink(k)
+        return heap
 
     def __len__(self) -> int:
         return self.length
 
     def is_full(self) -> bool:
+        """ Returns whether the array is full, so the next add has to grow it """
         return self.length + 1 == len(self.the_array)
 
+    def higher(self, first, second) -> bool:
+        """ Returns whether the first key belongs above the second """
+        return first > second
+
+    def grow(self) -> None:
+        """
+        Doubles the capacity of the arrays
+        :complexity: O(N) where N is the number of elements, O(1) amortised over the adds
+        """
+        new_array = ArrayR(2 * len(self.the_array))
+        new_keys = ArrayR(len(new_array))
+        for k in range(1, self.length + 1):
+            new_array[k] = self.the_array[k]
+            new_keys[k] = self.the_keys[k]
+        self.the_array = new_array
+        self.the_keys = new_keys
+
     def rise(self, k: int) -> None:
         """
         Rise element at index k to its correct position
         :pre: 1 <= k <= self.length
         """
         item = self.the_array[k]
-        while k > 1 and item > self.the_array[k // 2]:
+        item_key = self.the_keys[k]
+        while k > 1 and self.higher(item_key, self.the_keys[k // 2]):
             self.the_array[k] = self.the_array[k // 2]
+            self.the_keys[k] = self.the_keys[k // 2]
             k = k // 2
         self.the_array[k] = item
+        self.the_keys[k] = item_key
 
-    def add(self, element: T) -> bool:
+    def add(self, element: T) -> None:
         """
-        Swaps elements while rising
+        Swaps elements while rising, growing the array first if it is full
+        :complexity: O(log N) amortised where N is the number of elements
         """
         if self.is_full():
-            raise IndexError
+            self.grow()
 
         self.length += 1
         self.the_array[self.length] = element
+        self.the_keys[self.length] = element if self.key is None else self.key(element)
         self.rise(self.length)
 
     def largest_child(self, k: int) -> int:
         """
-        Returns the index of k's child with greatest value.
+        Returns the index of k's child which belongs highest.
         :pre: 1 <= k <= self.length // 2
         """
         
         if 2 * k == self.length or \
-                self.the_array[2 * k] > self.the_array[2 * k + 1]:
+                self.higher(self.the_keys[2 * k], self.the_keys[2 * k + 1]):
             return 2 * k
         else:
             return 2 * k + 1
@@ -57,18 +105,47 @@ class MaxHeap(Generic[T]):
     def sink(self, k: int) -> None:
         """ Make the element at index k sink to the correct position.
             :pre: 1 <= k <= self.length
-            :complexity: ???
+            :complexity: O(log N) where N is the number of elements
         """
         item = self.the_array[k]
+        item_key = self.the_keys[k]
 
         while 2 * k <= self.length:
             max_child = self.largest_child(k)
-            if self.the_array[max_child] <= item:
+            if not self.higher(self.the_keys[max_child], item_key):
                 break
             self.the_array[k] = self.the_array[max_child]
+            self.the_keys[k] = self.the_keys[max_child]
             k = max_child
 
         self.the_array[k] = item
+        self.the_keys[k] = item_key
+
+    def peek(self) -> T:
+        """ Return the element at the root without removing it. """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[1]
+
+    def replace_root(self, element: T) -> T:
+        """
+        Remove and return the element at the root, and add the given element, with a single sink
+        :complexity: O(log N) where N is the number of elements
+        """
+        return self.replace_root_with_key(element, element if self.key is None else self.key(element))
+
+    def replace_root_with_key(self, element: T, element_key) -> T:
+        """
+        replace_root, for an element whose key has already been computed
+        :complexity: O(log N) where N is the number of elements
+        """
+        if self.length == 0:
+            raise IndexError
+        root = self.the_array[1]
+        self.the_array[1] = element
+        self.the_keys[1] = element_key
+        self.sink(1)
+        return root
         
     def get_max(self) -> T:
         """ Remove (and return) the maximum element from the heap. """
@@ -79,16 +156,240 @@ class MaxHeap(Generic[T]):
         self.length -= 1
         if self.length > 0:
             self.the_array[1] = self.the_array[self.length+1]
+            self.the_keys[1] = self.the_keys[self.length+1]
             self.sink(1)
+        self.the_array[self.length+1] = None
+        self.the_keys[self.length+1] = None
         return max_elt
 
 
+class MinHeap(MaxHeap[T]):
+    """ Binary heap with the smallest element at the root. """
+
+    def higher(self, first, second) -> bool:
+        """ Returns whether the first key belongs above the second """
+        return first < second
+
+    def get_min(self) -> T:
+        """ Remove (and return) the minimum element from the heap. """
+        return self.get_max()
+
+
+class IndexedMaxHeap(Generic[T]):
+    """
+    Addressable binary heap of elements with float priorities, the highest priority at the root.
+
+    add returns a handle for the entry, an int which stays valid until the entry leaves the heap, so
+    its priority can be changed or the entry removed in O(log N). Priorities are kept in a float
+    array indexed by handle and the heap only compares those, never the elements. Entries with
+    equal priorities leave in the order they were added.
+
+    attributes:
+        elements: element of each handle, None once it has left the heap
+        priorities: priority of each handle
+        heap: handles in heap order, the root at index 0
+        positions: index in heap of each handle, -1 once it has left the heap
+    """
+
+    def __init__(self) -> None:
+        """
+        Creates an empty heap
+        :complexity: O(1)
+        """
+        self.elements = []
+        self.priorities = array('d')
+        self.heap = array('l')
+        self.positions = array('l')
+
+    @classmethod
+    def heapify(cls, entries: Iterable[tuple[T, float]]) -> IndexedMaxHeap[T]:
+        """
+        Builds a heap of (element, priority) pairs, handing out the handles in the order given, and
+        sinking from the last parent up to the root
+        :complexity: O(N) where N is the number of entries
+        """
+        heap = cls()
+        for element, priority in entries:
+            heap.elements.append(element)
+            heap.priorities.append(priority)
+            heap.positions.append(len(heap.heap))
+            heap.heap.append(len(heap.heap))
+        for k in range(len(heap.heap) // 2 - 1, -1, -1):
+            heap.sink(k)
+        return heap
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, handle: int) -> bool:
+        """ Returns whether the entry of the handle is still in the heap """
+        return 0 <= handle < len(self.positions) and self.positions[handle] != -1
+
+    def higher(self, first: int, second: int) -> bool:
+        """ Returns whether the entry of the first handle belongs above the second """
+        first_priority = self.priorities[first]
+        second_priority = self.priorities[second]
+        return first_priority > second_priority or (first_priority == second_priority and first < second)
+
+    def add(self, element: T, priority: float) -> int:
+        """
+        Adds an element with the given priority, and returns its handle
+        :complexity: O(log N) amortised where N is the number of entries
+        """
+        handle = len(self.elements)
+        self.elements.append(element)
+        self.priorities.append(priority)
+        self.positions.append(len(self.heap))
+        self.heap.append(handle)
+        self.rise(len(self.heap) - 1)
+        return handle
+
+    def element(self, handle: int) -> T:
+        """ Returns the element of a handle """
+        return self.elements[handle]
+
+    def priority(self, handle: int) -> float:
+        """ Returns the priority of a handle """
+        return self.priorities[handle]
+
+    def update(self, handle: int, priority: float) -> None:
+        """
+        Changes the priority of an entry still in the heap
+        :raises KeyError: if the entry has left the heap
+        :complexity: O(log N) where N is the number of entries
+        """
+        if handle not in self:
+            raise KeyError(handle)
+        old_priority = self.priorities[handle]
+        self.priorities[handle] = priority
+        if priority != old_priority:
+            self.rise(self.positions[handle])
+            self.sink(self.positions[handle])
+
+    def remove(self, handle: int) -> T:
+        """
+        Removes an entry still in the heap, and returns its element
+        :raises KeyError: if the entry has left the heap
+        :complexity: O(log N) where N is the number of entries
+        """
+        if handle not in self:
+            raise KeyError(handle)
+        k = self.positions[handle]
+        last = self.heap.pop()
+        if last != handle:
+            self.heap[k] = last
+            self.positions[last] = k
+            self.rise(k)
+            self.sink(self.positions[last])
+        self.positions[handle] = -1
+        element = self.elements[handle]
+        self.elements[handle] = None
+        return element
+
+    def peek(self) -> int:
+        """ Returns the handle at the root without removing it """
+        if len(self.heap) == 0:
+            raise IndexError
+        return self.heap[0]
+
+    def get_max(self) -> T:
+        """ Remove (and return) the element with the highest priority """
+        return self.remove(self.peek())
+
+    def rise(self, k: int) -> None:
+        """
+        Rise the handle at index k to its correct position
+        :complexity: O(log N) where N is the number of entries
+        """
+        heap = self.heap
+        handle = heap[k]
+        while k > 0 and self.higher(handle, heap[(k - 1) // 2]):
+            parent = heap[(k - 1) // 2]
+            heap[k] = parent
+            self.positions[parent] = k
+            k = (k - 1) // 2
+        heap[k] = handle
+        self.positions[handle] = k
+
+    def sink(self, k: int) -> None:
+        """
+        Make the handle at index k sink to the correct position
+        :complexity: O(log N) where N is the number of entries
+        """
+        heap = self.heap
+        handle = heap[k]
+        length = len(heap)
+        while 2 * k + 1 < length:
+            child = 2 * k + 1
+            if child + 1 < length and self.higher(heap[child + 1], heap[child]):
+                child += 1
+            if not self.higher(heap[child], handle):
+                break
+            heap[k] = heap[child]
+            self.positions[heap[child]] = k
+            k = child
+        heap[k] = handle
+        self.positions[handle] = k
+
+
+class IndexedMinHeap(IndexedMaxHeap[T]):
+    """ Addressable binary heap with the lowest priority at the root. """
+
+    def higher(self, first: int, second: int) -> bool:
+        """ Returns whether the entry of the first handle belongs above the second """
+        first_priority = self.priorities[first]
+        second_priority = self.priorities[second]
+        return first_priority < second_priority or (first_priority == second_priority and first < second)
+
+    def get_min(self) -> T:
+        """ Remove (and return) the element with the lowest priority """
+        return self.get_max()
+
+
+def top_k(k: int, iterable: Iterable[T], key: Callable[[T], object], heap: MaxHeap[T]) -> list[T]:
+    """
+    Returns the k elements that belong highest in the given empty heap, highest first, reading the
+    iterable once and keeping the k best in the heap. Its root is the worst of those kept, so the
+    heap must order the opposite way to the result. Of elements with equal keys, the ones seen
+    first are kept.
+    :complexity: O(N log k) where N is the number of elements
+    """
+    for element in iterable:
+        if len(heap) < k:
+            heap.add(element)
+        else:
+            element_key = element if key is None else key(element)
+            if heap.higher(heap.the_keys[1], element_key):
+                heap.replace_root_with_key(element, element_key)
+    result = [None] * len(heap)
+    for i in range(len(result) - 1, -1, -1):
+        result[i] = heap.get_max()
+    return result
+
+
+def nlargest(k: int, iterable: Iterable[T], key: Callable[[T], object] = None) -> list[T]:
+    """
+    Returns the k largest elements, largest first, holding at most k elements in a MinHeap
+    :complexity: O(N log k) where N is the number of elements
+    """
+    if k <= 0:
+        return []
+    return top_k(k, iterable, key, MinHeap(k, key))
+
+
+def nsmallest(k: int, iterable: Iterable[T], key: Callable[[T], object] = None) -> list[T]:
+    """
+    Returns the k smallest elements, smallest first, holding at most k elements in a MaxHeap
+    :complexity: O(N log k) where N is the number of elements
+    """
+    if k <= 0:
+        return []
+    return top_k(k, iterable, key, MaxHeap(k, key))
+
+
 if __name__ == '__main__':
     items = [ int(x) for x in input('Enter a list of numbers: ').strip().split() ]
-    heap = MaxHeap(len(items))
-
-    for item in items:
-        heap.add(item)
+    heap = MaxHeap.heapify(items)
         
     while(len(heap) > 0):
-        print(heap.get_max())
\ No newline at end of file
+        print(heap.get_max())
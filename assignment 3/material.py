@@ -94,8 +94,12 @@ class Material:
 
             Name and mining rate are either input or chosen at random
 
+        Attributes are held in slots rather than a dictionary, as worlds hold many materials.
+
     """
-    
+
+    __slots__ = ("name", "mining_rate")
+
     def __init__(self, name: str, mining_rate: float) -> None:
         """
         Initialises the constructor for Material
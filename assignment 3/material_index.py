@@ -0,0 +1,202 @@
+""" Index of caves and trader deals by material name. """
+from __future__ import annotations
+
+from cave import Cave
+from material import Material
+from trader import Trader
+from hash_table import LinearProbeTable
+
+
+class MaterialIndex:
+    """
+    Maps the name of a material to the caves holding it, and to the best deal any trader is offering for it.
+
+    The index holds the Cave objects themselves, so quantity changes made through Cave.remove_quantity
+    and Game.finish_day are seen without updating the index. The index watches its traders, and a
+    trader setting a new deal marks the deals stale, so they are rebuilt the next time they are read.
+
+    attributes:
+        caves: the caves in the index, in the order they were added
+        traders: the traders whose deals are indexed
+        caves_table: material name to the list of caves holding that material
+        deals_table: material name to the position of its best deal in deals
+        deals: the best (material, price) deal for each material, in the order traders first offered them
+        stale: whether a trader has changed its deal since the deals were built
+        generation: counts the changes to the caves and traders in the index
+    """
+
+    def __init__(self) -> None:
+        """
+        Creates an empty index
+
+        Complexity: O(1)
+        """
+        self.caves = []
+        self.traders = []
+        self.caves_table = LinearProbeTable(10)
+        self.deals_table = LinearProbeTable(10)
+        self.deals = []
+        self.stale = False
+        self.generation = 0
+
+    @classmethod
+    def from_lists(cls, caves: list[Cave], traders: list[Trader]) -> MaterialIndex:
+        """
+        Builds an index over the given caves and the current deals of the given traders
+
+        Complexity: O(C + T) where C is the number of caves and T the number of traders
+        """
+        index = MaterialIndex()
+        index.set_caves(caves)
+        index.update_deals(traders)
+        return index
+
+    def set_caves(self, caves: list[Cave]) -> None:
+        """
+        Replaces the caves in the index
+
+        Complexity: O(C) where C is the number of caves
+        """
+        self.caves = []
+        self.caves_table = LinearProbeTable(10)
+        for cave in caves:
+            self.add_cave(cave)
+
+    def add_cave(self, cave: Cave) -> None:
+        """
+        Adds a single cave to the index
+
+        Complexity: O(1) amortised
+        """
+        self.caves.append(cave)
+        self.generation += 1
+        name = cave.material.name
+        if name in self.caves_table:
+            self.caves_table[name].append(cave)
+        else:
+            self.caves_table[name] = [cave]
+
+    def caves_for(self, material: Material) -> list[Cave]:
+        """
+        Returns the caves holding the material, in the order they were added
+
+        Complexity: O(1)
+        """
+        if material.name in self.caves_table:
+            return self.caves_table[material.name]
+        return []
+
+    def update_deals(self, traders: list[Trader]) -> None:
+        """
+        Replaces the traders in the index, and builds the best deal for every material from their
+        current deals
+
+        Complexity: O(T) where T is the number of traders
+        """
+        for trader in self.traders:
+            trader.unwatch(self)
+        self.traders = list(traders)
+        self.generation += 1
+        for trader in self.traders:
+            trader.watch(self)
+        self.rebuild_deals()
+
+    def detach(self) -> None:
+        """
+        Stops watching the traders and empties the index, so an index which is no longer used is not
+        kept alive by its traders, nor told about their new deals
+
+        Complexity: O(T * W) where T is the number of traders and W the number of watchers of each
+        """
+        for trader in self.traders:
+            trader.unwatch(self)
+        self.traders = []
+        self.generation += 1
+        self.rebuild_deals()
+
+    def deals_changed(self) -> None:
+        """
+        Called by a trader of the index when its deal changes
+
+        Complexity: O(1)
+        """
+        self.stale = True
+
+    def rebuild_deals(self) -> None:
+        """
+        Rebuilds the best deal for every material from the traders' current deals
+
+        Complexity: O(T) where T is the number of traders
+        """
+        self.stale = False
+        traders = self.traders
+        self.deals_table = LinearProbeTable(10)
+        self.deals = []
+        for trader in traders:
+            deal = trader.deal
+            if deal is None:
+                continue
+            name = deal[0].name
+            if name not in self.deals_table:
+                self.deals_table[name] = len(self.deals)
+                self.deals.append(deal)
+            else:
+                position = self.deals_table[name]
+                if deal[1] > self.deals[position][1]:
+                    self.deals[position] = deal
+
+    def best_deal(self, material: Material) -> tuple[Material, float] | None:
+        """
+        Returns the best (material, price) deal offered for the material, or None if no trader is buying it
+
+        Complexity: O(1), plus O(T) to rebuild stale deals
+        """
+        if self.stale:
+            self.rebuild_deals()
+        if material.name in self.deals_table:
+            return self.deals[self.deals_table[material.name]]
+        return None
+
+    def is_sellable(self, material: Material) -> bool:
+        """
+        Returns whether some trader is currently buying the material
+
+        Complexity: O(1), plus O(T) to rebuild stale deals
+        """
+        if self.stale:
+            self.rebuild_deals()
+        return material.name in self.deals_table
+
+    def sellable_deals(self) -> list[tuple[Material, float]]:
+        """
+        Returns the best deal for every material that is both bought by a trader and found in a cave
+
+        Complexity: O(D) where D is the number of deals, plus O(T) to rebuild stale deals
+        """
+        if self.stale:
+            self.rebuild_deals()
+        return [deal for deal in self.deals if deal[0].name in self.caves_table]
+
+    def covers(self, caves: list[Cave], traders: list[Trader]) -> bool:
+        """
+        Returns whether the index holds exactly these caves and traders, in the same order
+
+        Complexity: O(C + T) where C is the number of caves and T the number of traders
+        """
+        return same_objects(self.caves, caves) and same_objects(self.traders, traders)
+
+
+def same_objects(first: list, second: list) -> bool:
+    """
+    Returns whether two lists hold the same objects in the same order
+
+    Complexity: O(N) where N is the length of the lists
+    """
+    if first is second:
+        return True
+    if len(first) != len(second):
+        return False
+    for position in range(len(first)):
+        if first[position] is not second[position]:
+            return False
+    return True
@@ -0,0 +1,153 @@
+"""
+Monte Carlo simulation of many independent seeded seasons, spread over a pool of processes.
+
+The game draws every random number from the class-level state of RandomGen, not from a generator of
+its own. A season sets that state from its seed before it starts and puts the caller's state back
+when it ends, so seasons run one after another in a process never see each other's draws, and the
+caller's RandomGen is left as it was. Worker processes each hold their own copy of the state. A season
+gives the same summary whether it runs serially or in any worker, in any order. Seasons must not run
+in several threads of one process at once, as the threads would share the state.
+
+Usage:
+```
+for summary in run_seasons(range(1000), days=365, processes=8):
+    print(summary.seed, summary.final_balances)
+```
+"""
+from __future__ import annotations
+
+from functools import partial
+from multiprocessing import Pool
+
+from runner import MODE_SOLO, new_game, run_game
+from random_gen import RandomGen
+
+
+class SeasonSummary:
+    """
+    Aggregate outcome of one seeded season.
+
+    attributes:
+        seed: the seed the season was run with
+        final_balances: tuple of every player's balance at the end of the season
+        gain_per_day: tuple of every player's average emerald gain per day
+        start_quantity: total quantity of material in all caves before the first day
+        end_quantity: total quantity of material in all caves after the last day
+        empty_caves: number of caves with nothing left to mine after the last day
+    """
+
+    __slots__ = ("seed", "final_balances", "gain_per_day", "start_quantity", "end_quantity", "empty_caves")
+
+    def __init__(self, seed: int, final_balances: tuple[float, ...], gain_per_day: tuple[float, ...], start_quantity: float, end_quantity: float, empty_caves: int) -> None:
+        """
+        Initialises the summary
+
+        Complexity: O(1)
+        """
+        self.seed = seed
+        self.final_balances = final_balances
+        self.gain_per_day = gain_per_day
+        self.start_quantity = start_quantity
+        self.end_quantity = end_quantity
+        self.empty_caves = empty_caves
+
+    def depletion(self) -> float:
+        """
+        Returns the fraction of the starting cave quantity which was gone by the end of the season.
+        This is negative when the caves regenerated more than was mined.
+
+        Complexity: O(1)
+        """
+        if self.start_quantity == 0:
+            return 0
+        return 1 - self.end_quantity / self.start_quantity
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Returns whether two summaries are identical
+
+        Complexity: O(P) where P is the number of players
+        """
+        if not isinstance(other, SeasonSummary):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        """
+        Returns the summary as a string
+
+        Complexity: O(P) where P is the number of players
+        """
+        return f"SeasonSummary(seed={self.seed}, final_balances={self.final_balances}, depletion={self.depletion():.3f}, empty_caves={self.empty_caves})"
+
+
+def simulate_season(seed: int, days: int, mode: str = MODE_SOLO) -> SeasonSummary:
+    """
+    Runs one headless season from the given seed and summarises it. RandomGen is restored to the
+    state it was in before the season, even if the season raises.
+
+    Complexity: O(I + D * S) where I is the cost of initialising the game, D is the number of days
+    and S the cost of simulating a day
+    """
+    saved_seed = RandomGen.seed
+    RandomGen.set_seed(seed)
+    try:
+        return _play_season(seed, days, mode)
+    finally:
+        RandomGen.set_seed(saved_seed)
+
+
+def _play_season(seed: int, days: int, mode: str) -> SeasonSummary:
+    """
+    Plays a season from the current state of RandomGen and summarises it, see simulate_season
+
+    Complexity: see simulate_season
+    """
+    game = new_game(mode)
+    game.initialise_game()
+    players = [game.player] if mode == MODE_SOLO else game.players
+    start_balances = [player.balance for player in players]
+    start_quantity = 0
+    for cave in game.get_caves():
+        start_quantity += cave.quantity
+
+    results = run_game(game, days, mode)
+
+    final_balances = results[-1].balances if len(results) > 0 else tuple(start_balances)
+    gain_per_day = tuple((final - start) / max(days, 1) for final, start in zip(final_balances, start_balances))
+    end_quantity = 0
+    empty_caves = 0
+    for cave in game.get_caves():
+        end_quantity += cave.quantity
+        if cave.quantity <= 0:
+            empty_caves += 1
+    return SeasonSummary(seed, final_balances, gain_per_day, start_quantity, end_quantity, empty_caves)
+
+
+def run_seasons(seeds, days: int, mode: str = MODE_SOLO, processes: int = None, chunksize: int = 1):
+    """
+    Simulates a season for every seed, and yields each SeasonSummary as soon as it is ready, in the
+    order of the seeds
+
+    Inputs:
+        seeds: iterable of seeds
+        days: number of days in every season
+        mode: MODE_SOLO or MODE_MULTIPLAYER
+        processes: number of worker processes, None for one per CPU. 1 runs every season in this process.
+        chunksize: number of seeds handed to a worker at a time
+
+    Complexity: O(N * R / W) where N is the number of seeds, R the cost of a season and W the number of workers
+    """
+    season = partial(simulate_season, days=days, mode=mode)
+    if processes == 1:
+        for seed in seeds:
+            yield season(seed)
+        return
+    with Pool(processes) as pool:
+        for summary in pool.imap(season, seeds, chunksize):
+            yield summary
+
+
+if __name__ == "__main__":
+    for summary in run_seasons(range(8), days=365):
+        print(summary)
@@ -35,6 +35,7 @@ class TreeNode(Generic[K, I]):
 
 class AVLTreeNode(TreeNode, Generic[K, I]):
     """ Node class for AVL trees.
+        Each node keeps the height and the number of nodes of its subtree.
     """
 
     def __init__(self, key: K, item: I = None) -> None:
@@ -46,3 +47,4 @@ class AVLTreeNode(TreeNode, Generic[K, I]):
 
         super(AVLTreeNode, self).__init__(key, item)
         self.height = 1
+        self.size = 1
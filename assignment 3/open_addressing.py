@@ -0,0 +1,319 @@
+""" Open Addressing Hash Tables
+
+Defines hash tables with the interface and statistics of LinearProbeTable, using
+other ways of resolving conflicts: Robin Hood linear probing, double hashing and
+quadratic probing.
+"""
+from __future__ import annotations
+__docformat__ = 'reStructuredText'
+
+
+from hash_table import LinearProbeTable, key_hash, DELETED
+from primes import is_prime
+from referential_array import ArrayR
+from typing import TypeVar
+T = TypeVar('T')
+
+
+class ProbeSequenceTable(LinearProbeTable[T]):
+    """
+        Open addressing table which visits the slots home + offset(i) for
+        i = 0, 1, 2, ... where home is the hash of the key.
+        Subclasses choose the offsets, deletion and statistics work as in
+        LinearProbeTable. The offsets only reach every slot they need to
+        when the tablesize is prime, so the tablesize must be prime.
+    """
+
+    def __init__(self, expected_size: int, tablesize_override: int = -1) -> None:
+        """
+            Initialiser for the hash table, as for LinearProbeTable
+            :raises ValueError: when tablesize_override is not prime
+            :complexity: O(P) where P is the complexity of finding the next prime
+        """
+        if tablesize_override != -1 and not is_prime(tablesize_override):
+            raise ValueError(f"Tablesize must be prime, not {tablesize_override}")
+        LinearProbeTable.__init__(self, expected_size, tablesize_override)
+
+    def _step(self, full_hash: int, size: int) -> int:
+        """
+            Returns the step used for every offset of a key with the given
+            key_hash, in a table of the given size
+            :complexity: O(1)
+        """
+        return 1
+
+    def _offset(self, attempt: int, step: int) -> int:
+        """
+            Returns the distance from the home position of the slot visited
+            at the given attempt
+            :complexity: O(1)
+        """
+        return attempt * step
+
+    def _linear_probe(self, key: str, is_insert: bool) -> int:
+        """
+            Find the correct position for this key in the hash table by
+            following its probe sequence
+            :complexity best: O(K) first position is empty
+                            where K is the size of the key
+            :complexity worst: O(K + N) when we've searched the entire table
+                            where N is the tablesize
+            :raises KeyError: When a position can't be found
+        """
+        size = len(self.table)
+        full_hash = key_hash(key)
+        home = full_hash % size
+        step = self._step(full_hash, size)
+
+        if is_insert and self.is_full():
+            raise KeyError(key)
+
+        chainStart = self.probe_total
+        conflicted = False
+        deletedPosition = -1
+        for attempt in range(size):
+            position = (home + self._offset(attempt, step)) % size
+            entry = self.table[position]
+            if entry is None:
+                if is_insert:
+                    self.probe_max=max(self.probe_max,self.probe_total - chainStart)
+                    return position if deletedPosition == -1 else deletedPosition
+                else:
+                    raise KeyError(key)
+            elif entry is not DELETED and entry[0] == key:
+                self.probe_max=max(self.probe_max,self.probe_total - chainStart)
+                return position
+            else:
+                if entry is DELETED and deletedPosition == -1:
+                    deletedPosition = position
+                if not conflicted:
+                    self.conflict_count += 1
+                    conflicted = True
+                self.probe_total += 1
+
+        if is_insert and deletedPosition != -1:
+            return deletedPosition
+        raise KeyError(key)
+
+    def _place_entries(self, newSize: int) -> None:
+        """
+            Moves every entry into a new array of the given size, following
+            the probe sequence of the hash stored with each entry.
+
+            Complexity: O(N)
+        """
+        newTable = ArrayR(newSize)
+        for entry in self.table.array:
+            if entry is not None and entry is not DELETED:
+                home = entry[2] % newSize
+                step = self._step(entry[2], newSize)
+                attempt = 0
+                position = home
+                if newTable[position] is not None:
+                    self.conflict_count += 1
+                    while newTable[position] is not None:
+                        attempt += 1
+                        position = (home + self._offset(attempt, step)) % newSize
+                self.probe_total += attempt
+                self.probe_max = max(self.probe_max,attempt)
+                newTable[position] = entry
+        self.table = newTable
+        self.tableSize = newSize
+        self.deleted_count = 0
+        self._invalidate_views()
+
+
+class QuadraticProbeTable(ProbeSequenceTable[T]):
+    """
+        Quadratic probing: the i-th slot tried is home + i*i.
+        With a prime tablesize the first (tablesize + 1) / 2 slots tried are
+        all different, so a table kept at most half full always finds a slot.
+    """
+
+    def _offset(self, attempt: int, step: int) -> int:
+        """
+            Returns attempt squared
+            :complexity: O(1)
+        """
+        return attempt * attempt
+
+
+class DoubleHashTable(ProbeSequenceTable[T]):
+    """
+        Double hashing: the i-th slot tried is home + i*step, where the step
+        comes from the part of the key's hash above the tablesize. Keys
+        sharing a home position usually follow different sequences, so
+        clusters do not build up as they do with linear probing.
+    """
+
+    def _step(self, full_hash: int, size: int) -> int:
+        """
+            Returns a step between 1 and size - 1, which visits every slot
+            when size is prime
+            :complexity: O(1)
+        """
+        if size <= 2:
+            return 1
+        return 1 + (full_hash // size) % (size - 1)
+
+
+class RobinHoodTable(LinearProbeTable[T]):
+    """
+        Linear probing where an insertion takes the slot of any entry it finds
+        closer to its own home than the new entry is, and carries that entry
+        on instead. This evens out the probe lengths, lets a search stop as
+        soon as it passes where the key would have been, and lets a deletion
+        shift the rest of its chain back, so no DELETED slots are left.
+    """
+
+    def _distance(self, entry: tuple, position: int, size: int) -> int:
+        """
+            Returns how far the entry at position is from its home position
+            :complexity: O(1)
+        """
+        return (position - entry[2] % size) % size
+
+    def _linear_probe(self, key: str, is_insert: bool) -> int:
+        """
+            Find the position of this key in the hash table. For an insertion of
+            a new key, returns the slot the key belongs in instead: the first one
+            which is empty or holds an entry closer to its own home than the key
+            would be there.
+            :complexity best: O(K) first position is empty
+                            where K is the size of the key
+            :complexity worst: O(K + D) where D is the largest distance of
+                            an entry from its home position
+            :raises KeyError: When the key is not in the table, or the table is
+                            full on insertion
+        """
+        if is_insert and self.is_full():
+            raise KeyError(key)
+
+        size = len(self.table)
+        position = key_hash(key) % size
+        chainStart = self.probe_total
+        for distance in range(size):
+            entry = self.table[position]
+            if entry is None or self._distance(entry, position, size) < distance:
+                # the key would have taken this slot
+                if is_insert:
+                    self.probe_max=max(self.probe_max,self.probe_total - chainStart)
+                    return position
+                raise KeyError(key)
+            if entry[0] == key:
+                self.probe_max=max(self.probe_max,self.probe_total - chainStart)
+                return position
+            if distance == 0:
+                self.conflict_count += 1
+            position = (position + 1) % size
+            self.probe_total += 1
+        raise KeyError(key)
+
+    def _insert_entry(self, table: ArrayR, entry: tuple, position: int = None, distance: int = 0) -> bool:
+        """
+            Places a (key, value, key_hash(key)) entry in the given array,
+            replacing the value if the key is already there. The search starts at
+            its home position, or at position when given, distance slots from
+            its home. Every entry it takes a slot from is carried on to the next
+            slot in the same way.
+            :returns: whether the key is new
+            :complexity best: O(1) first position is empty
+            :complexity worst: O(N) where N is the tablesize
+        """
+        size = len(table)
+        if position is None:
+            position = entry[2] % size
+        conflicted = distance > 0
+        carrying_new = True
+        chainStart = self.probe_total
+        while True:
+            resident = table[position]
+            if resident is None:
+                table[position] = entry
+                self.probe_max=max(self.probe_max,self.probe_total - chainStart)
+                return True
+            if carrying_new and resident[0] == entry[0]:
+                table[position] = entry
+                self.probe_max=max(self.probe_max,self.probe_total - chainStart)
+                return False
+            residentDistance = self._distance(resident, position, size)
+            if residentDistance < distance:
+                table[position] = entry
+                entry = resident
+                distance = residentDistance
+                carrying_new = False
+            if not conflicted:
+                self.conflict_count += 1
+                conflicted = True
+            position = (position + 1) % size
+            distance += 1
+            self.probe_total += 1
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+            Set an (key, data) pair in our hash table. The key is found by
+            _linear_probe like any other access, then the entries in the way of
+            a new key are carried on by _insert_entry.
+            :see: #self._linear_probe(key: str, is_insert: bool)
+            :see: #self._insert_entry(table: ArrayR, entry: tuple)
+
+            Best case: O(1)
+            Worst case: O(N)
+        """
+        if self.count > 0.5*self.tableSize:
+            self._rehash()
+
+        position = self._linear_probe(key, True)
+        entry = (key, data, key_hash(key))
+        resident = self.table[position]
+        if resident is not None and resident[0] == key:
+            self.table[position] = entry
+        else:
+            distance = (position - entry[2]) % self.tableSize
+            self._insert_entry(self.table, entry, position, distance)
+            self.count += 1
+        self._invalidate_views()
+
+    def __delitem__(self, key: str) -> None:
+        """
+            Deletes the entry for the key, and moves each following entry of
+            its chain back one slot, towards its home position
+            :see: #self._linear_probe(key: str, is_insert: bool)
+            :raises KeyError: when the key doesn't exist
+
+            Best case: O(1)
+            Worst case: O(N)
+        """
+        size = len(self.table)
+        position = self._linear_probe(key, False)
+        following = (position + 1) % size
+        while self.table[following] is not None and self._distance(self.table[following], following, size) > 0:
+            self.table[position] = self.table[following]
+            position = following
+            following = (following + 1) % size
+        self.table[position] = None
+        self.count -= 1
+        self._invalidate_views()
+
+    def _place_entries(self, newSize: int) -> None:
+        """
+            Moves every entry into a new array of the given size, using the hash
+            stored with each entry.
+
+            Complexity: O(N)
+        """
+        newTable = ArrayR(newSize)
+        for entry in self.table.array:
+            if entry is not None:
+                self._insert_entry(newTable, entry)
+        self.table = newTable
+        self.tableSize = newSize
+        self._invalidate_views()
+
+
+PROBING_STRATEGIES = {
+    "linear": LinearProbeTable,
+    "robin_hood": RobinHoodTable,
+    "double": DoubleHashTable,
+    "quadratic": QuadraticProbeTable,
+}
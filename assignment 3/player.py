@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from bisect import bisect_right
 from cave import Cave
 from material import Material
 from random_gen import RandomGen
 from trader import RandomTrader, Trader
 from food import Food
+from heap import MaxHeap
+from constants import EPSILON
+from material_index import MaterialIndex
 
 # List taken from https://minecraft.fandom.com/wiki/Mob
 PLAYER_NAMES = [
@@ -93,6 +97,11 @@ class Player():
 
     DEFAULT_EMERALDS = 50
 
+    STRATEGY_HEAP = "heap"
+    STRATEGY_SORT = "sort"
+    STRATEGY_PREFIX = "prefix"
+    DEFAULT_STRATEGY = STRATEGY_HEAP
+
     MIN_EMERALDS = 14
     MAX_EMERALDS = 40
 
@@ -113,6 +122,9 @@ class Player():
         self.name = name
 
         self.balance = self.DEFAULT_EMERALDS if emeralds is None else emeralds
+        self.index = None
+        self.own_index = None
+        self.index_checked = None
 
     def set_traders(self, traders_list: list[Trader]) -> None:
         """
@@ -123,10 +135,12 @@ class Player():
         Returns:
                 None
 
-        Worst case complexity: O(1)
+        Worst case complexity: O(T * W) where T is the number of traders and W the number of watchers
+                               of each, the player had built its own index
         Best Case complexity: O(1)
         """
         self.traders_list = traders_list
+        self.drop_own_index()
 
     def set_foods(self, foods_list: list[Food]) -> None:
         """
@@ -178,14 +192,247 @@ class Player():
         Returns:
                 None
 
-        Worst case complexity: O(1)
+        Worst case complexity: O(T * W) where T is the number of traders and W the number of watchers
+                               of each, the player had built its own index
         Best Case complexity: O(1)
         """
         self.caves_list = caves_list
+        self.drop_own_index()
+
+    def drop_own_index(self) -> None:
+        """
+        Detaches and forgets the index the player built for itself, so its traders stop holding it
 
-    def select_food_and_caves(self) -> tuple[Food | None, float, list[tuple[Cave, float]]]:
+        Worst case complexity: O(T * W) where T is the number of traders and W the number of watchers of each
+        Best Case complexity: O(1) the player has not built an index
+        """
+        if self.own_index is not None:
+            self.own_index.detach()
+        self.own_index = None
+        self.index_checked = None
+
+    def set_index(self, index: MaterialIndex) -> None:
+        """
+        Sets the index of caves and deals by material, shared with the game
 
+        Parameters:
+                index(MaterialIndex): index over the player's caves and traders
+        Returns:
+                None
+
+        Worst case complexity: O(1)
+        Best Case complexity: O(1)
+        """
+        self.index = index
+        self.index_checked = None
+
+    def select_food_and_caves(self, strategy: str = None) -> tuple[Food | None, float, list[tuple[Cave, float]]]:
+        """
+        Selects the food to buy and the caves to mine for the day
+
+        Parameters:
+                strategy(string): which optimiser to run, one of STRATEGY_HEAP, STRATEGY_PREFIX or
+                                  STRATEGY_SORT. Defaults to DEFAULT_STRATEGY.
+        Returns:
+                A tuple containing:
+                    A food object or None
+                    A float, the ending balance
+                    A list of tuples containing a cave object and the quantity mined from it
+
+        Raises:
+                ValueError: if the strategy is not known
+
+        All strategies mine materials greedily in order of emeralds per hunger, which is optimal as
+        materials can be mined fractionally. STRATEGY_PREFIX answers every food with a binary search, so
+        it is the better choice when many foods are offered. STRATEGY_SORT is the original insertion sort implementation
+        and is kept so the two can be compared on the same seeded world.
+
+        Worst case complexity: see the selected strategy
+        Best Case complexity: see the selected strategy
+        """
+        strategy = self.DEFAULT_STRATEGY if strategy is None else strategy
+        if strategy == self.STRATEGY_HEAP:
+            return self._select_with_heap()
+        if strategy == self.STRATEGY_PREFIX:
+            return self._select_with_prefix_sums()
+        if strategy == self.STRATEGY_SORT:
+            return self._select_with_sort()
+        raise ValueError(f"Unknown selection strategy: {strategy}")
+
+    def material_index(self) -> MaterialIndex:
+        """
+        Returns the index of caves and deals by material. This is the index shared by the game when it
+        holds exactly the player's caves and traders, otherwise an index the player builds from its own
+        caves and traders, which is kept until either is set again. Both indexes watch their traders,
+        so a trader generating a new deal is always seen.
+
+        Returns:
+                MaterialIndex
+
+        Worst case complexity: O(C + T) when the index has to be built, or the shared index checked
+                               after the caves, traders or index were set
+        Best Case complexity: O(1)
+        """
+        index = self.index
+        if index is not None:
+            if self.index_checked is None or self.index_checked[0] != index.generation:
+                self.index_checked = (index.generation, index.covers(self.caves_list, self.traders_list))
+            if self.index_checked[1]:
+                return index
+        if self.own_index is None:
+            self.own_index = MaterialIndex.from_lists(self.caves_list, self.traders_list)
+        return self.own_index
+
+    def _efficiencies(self, deals: list[tuple[Material, float]]) -> list[tuple[float, int, Material]]:
+        """
+        Pairs every deal with the emeralds it pays per hunger spent mining, for a heap to order
+
+        Returns:
+                list of (emeralds per hunger, position of the deal, material)
+
+        Worst case complexity: O(T) where T is the number of deals
+        Best Case complexity: O(T) where T is the number of deals
+        """
+        result = []
+        for order in range(len(deals)):
+            material, price = deals[order]
+            # the order breaks ties so materials are never compared, and later traders win ties as before
+            result.append((price / material.mining_rate, order, material))
+        return result
+
+    def _select_with_heap(self) -> tuple[Food | None, float, list[tuple[Cave, float]]]:
+        """
+        Method:
+            The sellable materials are placed in a MaxHeap keyed on emeralds per hunger. Materials are only
+            removed from the heap when a food actually needs them, and are remembered in the order they came
+            out so every later food walks the same prefix without touching the heap again. Each food stops
+            walking as soon as its hunger is used up, so only the caves that are actually mined are visited.
 
+        Returns: A tuple containing:
+            A food objects
+            A floats
+            A list of tuples containing a cave object and a float
+
+        Complexity: O(T log T + F * k), plus O(C + T) to build the index when the game has not shared one
+            T = number of traders
+            C = number of caves
+            F = number of foods
+            k = number of caves visited for a single food
+        """
+        index = self.material_index()
+        deals = index.sellable_deals()
+
+        heap = MaxHeap.heapify(self._efficiencies(deals))
+
+        ordered = []
+        return_tuple = (None, self.balance, [])
+        max_ending_emeralds = self.balance
+
+        for food in self.foods_list:
+            if food.price > self.balance:
+                continue
+            ending_emeralds = self.balance - food.price
+            hunger = food.hunger_bars
+            caves_visited = []
+            position = 0
+
+            while hunger > EPSILON:
+                if position == len(ordered):
+                    if len(heap) == 0:
+                        break
+                    ordered.append(heap.get_max())
+                emeralds_per_hunger, _, material = ordered[position]
+                position += 1
+
+                for cave in index.caves_for(material):
+                    if hunger <= EPSILON:
+                        break
+                    if cave.quantity <= 0:
+                        continue
+                    if cave.quantity * material.mining_rate >= hunger:
+                        actual_mined = hunger / material.mining_rate
+                        hunger_used = hunger
+                    else:
+                        actual_mined = cave.quantity
+                        hunger_used = actual_mined * material.mining_rate
+                    ending_emeralds += hunger_used * emeralds_per_hunger
+                    hunger -= hunger_used
+                    caves_visited.append((cave, actual_mined))
+
+            if ending_emeralds > max_ending_emeralds:
+                max_ending_emeralds = ending_emeralds
+                return_tuple = (food, max_ending_emeralds, caves_visited)
+
+        return return_tuple
+
+    def _select_with_prefix_sums(self) -> tuple[Food | None, float, list[tuple[Cave, float]]]:
+        """
+        Method:
+            Every food walks the same greedy order of caves, only the hunger budget changes. So the caves are
+            laid out once in order of emeralds per hunger, with running totals of the hunger needed to empty
+            them and the emeralds that earns. A food with H hunger empties every cave whose running hunger
+            total is at most H, found by binary search, and spends what is left on part of the next cave.
+            Only the best food has its list of caves built.
+
+        Returns: A tuple containing:
+            A food objects
+            A floats
+            A list of tuples containing a cave object and a float
+
+        Complexity: O(T log T + C + F log C), plus O(C + T) to build the index when the game has not shared one
+            T = number of traders
+            C = number of caves
+            F = number of foods
+        """
+        index = self.material_index()
+        deals = index.sellable_deals()
+
+        heap = MaxHeap.heapify(self._efficiencies(deals))
+
+        caves_ordered = []
+        emeralds_per_hunger = []
+        hunger_totals = [0]
+        emerald_totals = [0]
+        while len(heap) > 0:
+            efficiency, _, material = heap.get_max()
+            for cave in index.caves_for(material):
+                if cave.quantity <= 0:
+                    continue
+                hunger = cave.quantity * material.mining_rate
+                caves_ordered.append(cave)
+                emeralds_per_hunger.append(efficiency)
+                hunger_totals.append(hunger_totals[-1] + hunger)
+                emerald_totals.append(emerald_totals[-1] + hunger * efficiency)
+
+        best_food = None
+        best_full = 0
+        max_ending_emeralds = self.balance
+        for food in self.foods_list:
+            if food.price > self.balance:
+                continue
+            # number of caves this food can empty completely
+            full = bisect_right(hunger_totals, food.hunger_bars) - 1
+            ending_emeralds = self.balance - food.price + emerald_totals[full]
+            if full < len(caves_ordered):
+                ending_emeralds += (food.hunger_bars - hunger_totals[full]) * emeralds_per_hunger[full]
+            if ending_emeralds > max_ending_emeralds:
+                max_ending_emeralds = ending_emeralds
+                best_food = food
+                best_full = full
+
+        if best_food is None:
+            return (None, self.balance, [])
+
+        caves_visited = []
+        for position in range(best_full):
+            caves_visited.append((caves_ordered[position], caves_ordered[position].quantity))
+        remaining = best_food.hunger_bars - hunger_totals[best_full]
+        if best_full < len(caves_ordered) and remaining > EPSILON:
+            cave = caves_ordered[best_full]
+            caves_visited.append((cave, remaining / cave.material.mining_rate))
+        return (best_food, max_ending_emeralds, caves_visited)
+
+    def _select_with_sort(self) -> tuple[Food | None, float, list[tuple[Cave, float]]]:
         """
         Method:
             This aproach calculates the most efficent materials to mine each day based on their mining rate and
@@ -1,4 +1,9 @@
-""""""
+"""
+Prime table sizes for the hash tables.
+
+Primes are tested with deterministic Miller-Rabin, and the largest prime found below each bound is
+cached for the whole process, as every table created or rehashed asks for one.
+"""
 
 from __future__ import annotations
 
@@ -6,6 +11,60 @@ from __future__ import annotations
 __author__ = ''
 __docformat__ = 'reStructuredText'
 
+# Testing against these bases is exact for every n below 3.3 * 10**24
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+_largest_prime_below = {}
+
+
+def is_prime(n: int) -> bool:
+    """
+        Returns whether n is prime, using deterministic Miller-Rabin
+
+        Complexity: O(B * log(N)^3) where B is the number of bases
+    """
+    if n < 2:
+        return False
+    for base in MILLER_RABIN_BASES:
+        if n % base == 0:
+            return n == base
+
+    odd = n - 1
+    twos = 0
+    while odd % 2 == 0:
+        odd //= 2
+        twos += 1
+
+    for base in MILLER_RABIN_BASES:
+        x = pow(base, odd, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(twos - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def largest_prime_below(bound: int) -> int:
+    """
+        Returns the largest prime strictly below bound, or None when there is none.
+        Answers are cached for the lifetime of the process.
+
+        Complexity: O(1) when cached, otherwise O(G * M) where G is the gap to the
+        prime found and M the complexity of is_prime
+    """
+    if bound in _largest_prime_below:
+        return _largest_prime_below[bound]
+    number = bound - 1
+    while number >= 2 and not is_prime(number):
+        number -= 1
+    prime = number if number >= 2 else None
+    _largest_prime_below[bound] = prime
+    return prime
+
 
 class LargestPrimeIterator():
 
@@ -16,33 +75,29 @@ class LargestPrimeIterator():
     def __init__(self,upper_bound,factor):
         """
             Initialises the attriubutes for the object
-            
+
             Complexity: O(1)
         """
 
         self.upper_bound = upper_bound
         self.factor = factor
         self.highest_prime = 2
-    
+
     def __next__(self):
 
         """
-            Method for finding the next highest prime between two primes
+            Method for finding the next highest prime between two primes.
+            This is the largest prime below the upper bound, or the highest prime so far
+            if there is none above it.
 
-            Complexity: O(N^2) where N is the upper bound
+            Complexity: O(1) when cached, otherwise see largest_prime_below
         """
-        
-        for number in range(self.highest_prime, self.upper_bound):
-            is_prime = True
-            for factor in range(2,number):
-                if number % factor == 0:
-                    is_prime = False
-                    break
-            if is_prime:
-                self.highest_prime = number
+
+        if self.upper_bound > self.highest_prime:
+            self.highest_prime = largest_prime_below(self.upper_bound)
         self.upper_bound = self.highest_prime * self.factor
         return self.highest_prime
-    
+
     def __iter__(self):
         return self
 
@@ -0,0 +1,138 @@
+"""
+Headless batch simulation of seeded games.
+
+Runs whole seasons without building or printing any of the game's output, and returns one compact
+record per day instead. Pass a sink to see the events the game would otherwise print.
+
+Usage:
+```
+results = run_headless(seed=1234, days=365, mode=MODE_SOLO)
+results[-1].balances      # (balance of each player at the end of the season,)
+```
+"""
+from __future__ import annotations
+
+from game import Game, SoloGame, MultiplayerGame
+from random_gen import RandomGen
+from telemetry import Telemetry
+
+MODE_SOLO = "solo"
+MODE_MULTIPLAYER = "multiplayer"
+
+GAME_MODES = {
+    MODE_SOLO: SoloGame,
+    MODE_MULTIPLAYER: MultiplayerGame,
+}
+
+
+class DayResult:
+    """
+    The outcome of one simulated day.
+
+    attributes:
+        day: the day number, starting from 0
+        balances: tuple of every player's balance at the end of the day
+        caves_visited: number of caves mined from during the day
+        quantity_mined: total quantity of material mined during the day
+    """
+
+    __slots__ = ("day", "balances", "caves_visited", "quantity_mined")
+
+    def __init__(self, day: int, balances: tuple[float, ...], caves_visited: int, quantity_mined: float) -> None:
+        """
+        Initialises the record
+
+        Complexity: O(1)
+        """
+        self.day = day
+        self.balances = balances
+        self.caves_visited = caves_visited
+        self.quantity_mined = quantity_mined
+
+    def __repr__(self) -> str:
+        """
+        Returns the record as a string
+
+        Complexity: O(P) where P is the number of players
+        """
+        return f"DayResult(day={self.day}, balances={self.balances}, caves_visited={self.caves_visited}, quantity_mined={self.quantity_mined})"
+
+
+def new_game(mode: str, sink=None) -> Game:
+    """
+    Creates an empty game of the given mode
+
+    Raises:
+        ValueError: if the mode is not one of GAME_MODES
+
+    Complexity: O(1)
+    """
+    if mode not in GAME_MODES:
+        raise ValueError(f"Unknown game mode: {mode}")
+    return GAME_MODES[mode](sink=sink)
+
+
+def record_day(day: int, mode: str, selection: tuple) -> DayResult:
+    """
+    Summarises the (foods, balances, caves) selection returned by simulate_day
+
+    Complexity: O(P) where P is the number of players, or the number of caves visited in solo mode
+    """
+    if mode == MODE_SOLO:
+        _, balance, caves = selection
+        balances = (balance,)
+    else:
+        _, balances, caves = selection
+        balances = tuple(balances)
+        caves = [item for item in caves if item is not None]
+    quantity_mined = 0
+    for _, mined in caves:
+        quantity_mined += mined
+    return DayResult(day, balances, len(caves), quantity_mined)
+
+
+def run_game(game: Game, days: int, mode: str, telemetry: Telemetry = None) -> list[DayResult]:
+    """
+    Simulates the given number of days of an initialised game, recording the game's hash tables
+    at the end of each day if telemetry is given
+
+    Complexity: O(D * S) where D is the number of days and S the cost of simulating a day
+    """
+    if telemetry is not None:
+        telemetry.watch(game)
+    results = []
+    for day in range(days):
+        selection = game.simulate_day()
+        game.finish_day()
+        results.append(record_day(day, mode, selection))
+        if telemetry is not None:
+            telemetry.record(game, day)
+    return results
+
+
+def run_headless(seed: int, days: int, mode: str = MODE_SOLO, sink=None, telemetry: Telemetry = None) -> list[DayResult]:
+    """
+    Seeds the random generator, creates and initialises a random game, and simulates it for the given
+    number of days
+
+    Inputs:
+        seed: seed for RandomGen
+        days: number of days to simulate
+        mode: MODE_SOLO or MODE_MULTIPLAYER
+        sink: optional event sink, called as sink(event, payload). See game.print_sink.
+        telemetry: optional Telemetry recording the game's hash tables
+
+    Returns: a DayResult for every day simulated
+
+    Complexity: O(I + D * S) where I is the cost of initialising the game, D is the number of days
+    and S the cost of simulating a day
+    """
+    RandomGen.set_seed(seed)
+    game = new_game(mode, sink)
+    game.initialise_game()
+    return run_game(game, days, mode, telemetry)
+
+
+if __name__ == "__main__":
+    for result in run_headless(1234, 10, MODE_MULTIPLAYER):
+        print(result)
@@ -0,0 +1,254 @@
+"""
+Telemetry for the hash tables of a running game.
+
+Periodically snapshots the probe statistics, load factor and rehash count of the game's material,
+cave and trader tables, along with the wall time spent probing and rehashing each of them, and
+raises alerts through the game's sink when a table degenerates.
+
+Usage:
+```
+telemetry = Telemetry(every=7)
+run_headless(seed=1234, days=365, telemetry=telemetry)
+telemetry.export_csv("tables.csv")
+```
+"""
+from __future__ import annotations
+
+import csv
+import time
+
+from hash_table import LinearProbeTable
+
+GAME_TABLES = ("materials_table", "caves_table", "traders_table")
+
+EVENT_TABLE_ALERT = "table_alert"
+
+
+class TableTimer:
+    """
+    Times the _linear_probe and _rehash calls of one table, by wrapping the methods of that instance.
+
+    attributes:
+        table: the table being timed
+        probe_calls: number of calls to _linear_probe
+        probe_seconds: wall time spent in _linear_probe
+        rehash_seconds: wall time spent in _rehash
+    """
+
+    __slots__ = ("table", "probe_calls", "probe_seconds", "rehash_seconds")
+
+    def __init__(self, table: LinearProbeTable) -> None:
+        """
+        Starts timing the table
+
+        Complexity: O(1)
+        """
+        self.table = table
+        self.probe_calls = 0
+        self.probe_seconds = 0.0
+        self.rehash_seconds = 0.0
+
+        probe = table._linear_probe
+        rehash = table._rehash
+
+        def timed_probe(key: str, is_insert: bool) -> int:
+            start = time.perf_counter()
+            try:
+                return probe(key, is_insert)
+            finally:
+                self.probe_seconds += time.perf_counter() - start
+                self.probe_calls += 1
+
+        def timed_rehash() -> None:
+            start = time.perf_counter()
+            try:
+                rehash()
+            finally:
+                self.rehash_seconds += time.perf_counter() - start
+
+        table._linear_probe = timed_probe
+        table._rehash = timed_rehash
+
+    def stop(self) -> None:
+        """
+        Restores the table's own methods
+
+        Complexity: O(1)
+        """
+        del self.table._linear_probe
+        del self.table._rehash
+
+
+class TableSnapshot:
+    """
+    The state of one table at the end of a day.
+
+    attributes:
+        day: the day number, starting from 0
+        table: the name of the game attribute holding the table
+        count: number of entries
+        tablesize: number of slots
+        load_factor: fraction of the slots holding an entry or DELETED
+        conflicts, probe_total, probe_max, rehash_count: the table's statistics()
+        probe_calls: number of probes since the table was first watched
+        probe_seconds: wall time spent probing since the table was first watched
+        rehash_seconds: wall time spent rehashing since the table was first watched
+    """
+
+    __slots__ = ("day", "table", "count", "tablesize", "load_factor", "conflicts", "probe_total", "probe_max",
+                 "rehash_count", "probe_calls", "probe_seconds", "rehash_seconds")
+
+    def __init__(self, day: int, name: str, table: LinearProbeTable, timer: TableTimer) -> None:
+        """
+        Records the table's current state
+
+        Complexity: O(1)
+        """
+        self.day = day
+        self.table = name
+        self.count = table.count
+        self.tablesize = table.tableSize
+        self.load_factor = (table.count + table.deleted_count) / table.tableSize
+        self.conflicts, self.probe_total, self.probe_max, self.rehash_count = table.statistics()
+        self.probe_calls = timer.probe_calls
+        self.probe_seconds = timer.probe_seconds
+        self.rehash_seconds = timer.rehash_seconds
+
+    def row(self) -> list:
+        """
+        Returns the snapshot as a CSV row, in the order of __slots__
+
+        Complexity: O(1)
+        """
+        return [getattr(self, name) for name in self.__slots__]
+
+    def __repr__(self) -> str:
+        """
+        Returns the snapshot as a string
+
+        Complexity: O(1)
+        """
+        return f"TableSnapshot(day={self.day}, table={self.table}, load_factor={self.load_factor:.2f}, probe_max={self.probe_max}, rehash_count={self.rehash_count})"
+
+
+class Telemetry:
+    """
+    Records a TableSnapshot of every game table every few days, and alerts on degenerate tables.
+
+    A table is degenerate when its longest probe chain exceeds max_probe_chain, when it is fuller than
+    max_load_factor, or when the probes since the last snapshot averaged more than max_mean_probes
+    slots past the home slot each. Entries moved by a rehash count towards the slots probed but not
+    towards the probes made, so a table that rehashed since the last snapshot reads a little high.
+
+    attributes:
+        every: number of days between snapshots
+        snapshots: every snapshot taken, in order
+        alerts: every alert raised, as (day, table, message)
+        timers: the TableTimer of each table currently timed, by game attribute
+        last: the last snapshot of each table currently timed, by game attribute
+    """
+
+    MAX_PROBE_CHAIN = 32
+    MAX_LOAD_FACTOR = 0.75
+    MAX_MEAN_PROBES = 2.0
+
+    def __init__(self, every: int = 1, max_probe_chain: int = MAX_PROBE_CHAIN, max_load_factor: float = MAX_LOAD_FACTOR,
+                 max_mean_probes: float = MAX_MEAN_PROBES) -> None:
+        """
+        Creates telemetry with no snapshots
+
+        Raises:
+            ValueError: if every is not positive
+
+        Complexity: O(1)
+        """
+        if every < 1:
+            raise ValueError(f"Snapshot interval must be positive: {every}")
+        self.every = every
+        self.max_probe_chain = max_probe_chain
+        self.max_load_factor = max_load_factor
+        self.max_mean_probes = max_mean_probes
+        self.snapshots = []
+        self.alerts = []
+        self.timers = {}
+        self.last = {}
+
+    def watch(self, game) -> None:
+        """
+        Starts timing every table of the game. Tables the game has replaced since are timed instead.
+
+        Complexity: O(1)
+        """
+        for name in GAME_TABLES:
+            table = getattr(game, name)
+            timer = self.timers.get(name)
+            if timer is None or timer.table is not table:
+                self.timers[name] = TableTimer(table)
+                self.last.pop(name, None)
+
+    def record(self, game, day: int) -> list[TableSnapshot]:
+        """
+        Snapshots every table of the game if day falls on the interval, and emits any alerts through
+        the game's sink as a "table_alert" event
+
+        Returns: the snapshots taken, empty if the day is not on the interval
+
+        Complexity: O(1)
+        """
+        self.watch(game)
+        if day % self.every != 0:
+            return []
+        taken = []
+        messages = []
+        for name in GAME_TABLES:
+            snapshot = TableSnapshot(day, name, getattr(game, name), self.timers[name])
+            for message in self.check(snapshot, self.last.get(name)):
+                self.alerts.append((day, name, message))
+                messages.append(f"{name}: {message}")
+            self.last[name] = snapshot
+            taken.append(snapshot)
+        self.snapshots.extend(taken)
+        if len(messages) > 0:
+            game.emit(EVENT_TABLE_ALERT, messages)
+        return taken
+
+    def check(self, snapshot: TableSnapshot, previous: TableSnapshot = None) -> list[str]:
+        """
+        Returns a message for every threshold the snapshot breaks. previous is the last snapshot of
+        the same table, used for the mean probe length since then.
+
+        Complexity: O(1)
+        """
+        messages = []
+        if snapshot.probe_max > self.max_probe_chain:
+            messages.append(f"probe chain of {snapshot.probe_max} slots exceeds {self.max_probe_chain}")
+        if snapshot.load_factor > self.max_load_factor:
+            messages.append(f"load factor {snapshot.load_factor:.2f} exceeds {self.max_load_factor}")
+        calls = snapshot.probe_calls - (previous.probe_calls if previous is not None else 0)
+        probes = snapshot.probe_total - (previous.probe_total if previous is not None else 0)
+        if calls > 0 and probes / calls > self.max_mean_probes:
+            messages.append(f"mean probe length {probes / calls:.2f} exceeds {self.max_mean_probes}")
+        return messages
+
+    def stop(self) -> None:
+        """
+        Stops timing every table
+
+        Complexity: O(1)
+        """
+        for timer in self.timers.values():
+            timer.stop()
+        self.timers = {}
+        self.last = {}
+
+    def export_csv(self, path: str) -> None:
+        """
+        Writes every snapshot to a CSV file, one row per table per snapshot, with a header row
+
+        Complexity: O(S) where S is the number of snapshots
+        """
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(TableSnapshot.__slots__)
+            for snapshot in self.snapshots:
+                writer.writerow(snapshot.row())
@@ -0,0 +1,79 @@
+from allocation import allocate_players
+from cave import Cave
+from food import Food
+from game import ALLOCATION_SHARES, MultiplayerGame
+from material import Material
+from random_gen import RandomGen
+from trader import RandomTrader
+import unittest
+
+
+class TestAllocation(unittest.TestCase):
+    """ Testing the allocation of caves to players who may share them. """
+
+    def world(self):
+        gold = Material("Gold Nugget", 1)
+        netherite = Material("Netherite Ingot", 2)
+        caves = [
+            Cave("Boulderfall Cave", gold, 10),
+            Cave("Castle Karstaag Ruins", netherite, 4),
+            Cave("Glacial Cave", gold, 0.5),
+        ]
+        ruby = RandomTrader("Ruby Goodman")
+        ruby.add_material(netherite)
+        ruby.deal = (netherite, 8)
+        mable = RandomTrader("Mable Hodge")
+        mable.add_material(gold)
+        mable.deal = (gold, 6)
+        return [gold, netherite], caves, [ruby, mable]
+
+    def test_shared_cave(self):
+        materials, caves, traders = self.world()
+        g = MultiplayerGame(sink=None)
+        g.initialise_with_data(materials, caves, traders, ["Alex", "Steve", "Jo", "Ali", "Sam", "Kim"], [50, 5, 50, 50, 50, 50])
+        food = Food("Cabbage Seeds", 3, 10)
+        foods, balances, selected = allocate_players(g.players, caves, food, g.material_index)
+
+        # gold shares of 3 sell for 18, the netherite share of 1.5 for 12, the last gold share of 1 and
+        # the 0.5 of gold in the glacial cave for less than the food. Steve cannot afford the food.
+        self.assertEqual([item[0].name if item else None for item in selected],
+                         ["Boulderfall Cave", None, "Boulderfall Cave", "Boulderfall Cave", "Castle Karstaag Ruins", "Castle Karstaag Ruins"])
+        self.assertEqual([item[1] if item else None for item in selected], [3, None, 3, 3, 1.5, 1.5])
+        self.assertEqual(foods, [food, None, food, food, food, food])
+        self.assertEqual(balances, [58, 5, 58, 58, 52, 52])
+
+    def test_shares_mode(self):
+        materials, caves, traders = self.world()
+        g = MultiplayerGame(sink=None)
+        g.ALLOCATION = ALLOCATION_SHARES
+        g.initialise_with_data(materials, caves, traders, ["Alex", "Steve"], [50, 50])
+        food = Food("Cabbage Seeds", 3, 10)
+        self.assertEqual(g.select_for_players(food), allocate_players(g.players, caves, food, g.material_index))
+
+    def test_beats_greedy(self):
+        for seed in range(10):
+            RandomGen.set_seed(seed)
+            g = MultiplayerGame(sink=None)
+            g.initialise_game()
+            for _ in range(5):
+                g.generate_deals()
+                food = Food.random_food()
+                greedy = g.select_for_players(food)
+                shares = allocate_players(g.players, g.get_caves(), food, g.material_index)
+                greedy_gain = sum(greedy[1][i] - g.players[i].balance for i in range(len(g.players)))
+                shares_gain = sum(shares[1][i] - g.players[i].balance for i in range(len(g.players)))
+                self.assertGreaterEqual(shares_gain, greedy_gain - 1e-9)
+
+                mined = {}
+                for i in range(len(g.players)):
+                    if shares[2][i] is not None:
+                        self.assertGreaterEqual(g.players[i].balance, food.price)
+                        cave, amount = shares[2][i]
+                        mined[cave.name] = mined.get(cave.name, 0) + amount
+                        self.assertGreater(shares[1][i], g.players[i].balance)
+                for cave in g.get_caves():
+                    self.assertLessEqual(mined.get(cave.name, 0), cave.quantity + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -129,6 +129,36 @@ class TestAVL(unittest.TestCase):
 
             self.assertTrue(self.check_balance(tree.root), 'The tree is unbalanced!')
 
+    def check_heights(self, current: AVLTreeNode) -> int:
+        if current is None:
+            return 0
+        left = self.check_heights(current.left)
+        right = self.check_heights(current.right)
+        self.assertEqual(current.height, 1 + max(left, right), 'Stored height is wrong for key node ({0}, {1})'.format(current.key, current.item))
+        self.assertIn(right - left, (-1, 0, 1))
+        self.assertEqual(current.size, 1 + (current.left.size if current.left else 0) + (current.right.size if current.right else 0))
+        return current.height
+
+    def testSortedInsertDelete(self):
+        tree = AVLTree()
+        numbers = list(range(20000))
+        for num in numbers:
+            tree[num] = num
+        self.assertEqual(len(tree), 20000)
+        self.assertLess(tree.root.height, 1.440420 * math.log2(20000 + 2))
+        self.assertEqual(tree.inorder_traversal(), numbers)
+
+        random.seed(16)
+        to_delete = numbers[:]
+        random.shuffle(to_delete)
+        for num in to_delete[:15000]:
+            del tree[num]
+        del tree[-1]  # not in the tree
+        self.assertEqual(len(tree), 5000)
+        self.check_heights(tree.root)
+        remaining = [num for num in numbers if num in tree]
+        self.assertEqual(tree.inorder_traversal(), remaining)
+
     def test_range_between(self):
         random.seed(16)
         numbers = list(range(1, 100))
@@ -139,6 +169,69 @@ class TestAVL(unittest.TestCase):
 
         self.assertEqual(tree.range_between(1, 5), [2, 3, 4, 5, 6], "Range between failed")
 
+    def test_order_statistics(self):
+        random.seed(16)
+        numbers = list(range(0, 2000, 2))
+        random.shuffle(numbers)
+        tree = AVLTree()
+        for num in numbers:
+            tree[num] = str(num)
+        for num in numbers[:600]:
+            del tree[num]
+        remaining = sorted(numbers[600:])
+        self.check_heights(tree.root)
+
+        for k in range(len(remaining)):
+            self.assertEqual(tree.kth(k), str(remaining[k]))
+            self.assertEqual(tree.rank(remaining[k]), k)
+            self.assertEqual(tree.rank(remaining[k] + 1), k + 1)  # odd keys are never in the tree
+        self.assertRaises(IndexError, lambda: tree.kth(len(remaining)))
+        self.assertRaises(IndexError, lambda: tree.kth(-1))
+
+        for i, j in [(0, 0), (0, 399), (17, 42), (390, 500), (5, 4), (400, 410)]:
+            self.assertEqual(tree.range_between(i, j), remaining[i:j + 1])
+            self.assertEqual(tree.items_between(i, j), [str(num) for num in remaining[i:j + 1]])
+
+
+    def test_from_sorted(self):
+        for length in [0, 1, 2, 7, 100, 1023]:
+            tree = AVLTree.from_sorted([(num, str(num)) for num in range(length)])
+            self.assertEqual(len(tree), length)
+            self.check_heights(tree.root)
+            self.assertEqual(tree.inorder_traversal(), [str(num) for num in range(length)])
+            if length > 0:
+                self.assertLessEqual(tree.root.height, math.floor(math.log2(length)) + 1)
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted([(1, 1), (3, 3), (3, 3)])
+
+    def test_union_split_join(self):
+        random.seed(16)
+        first = random.sample(range(1000), 300)
+        second = random.sample(range(1000), 40)
+        tree = AVLTree.from_sorted([(num, "first") for num in sorted(first)])
+        other = AVLTree()
+        for num in second:
+            other[num] = "second"
+
+        merged = tree.union(other)
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(len(merged), len(set(first) | set(second)))
+        self.check_heights(merged.root)
+        self.assertEqual([key for key in merged], sorted(set(first) | set(second)))
+        for num in second:
+            self.assertEqual(merged[num], "first" if num in first else "second")
+
+        smaller, larger = merged.split(500)
+        self.check_heights(smaller.root)
+        self.check_heights(larger.root)
+        self.assertEqual([key for key in smaller], sorted(num for num in set(first) | set(second) if num < 500))
+        self.assertEqual([key for key in larger], sorted(num for num in set(first) | set(second) if num >= 500))
+        with self.assertRaises(ValueError):
+            larger.join(smaller)
+
+        joined = smaller.join(larger)
+        self.check_heights(joined.root)
+        self.assertEqual([key for key in joined], sorted(set(first) | set(second)))
 
 
 if __name__ == '__main__':
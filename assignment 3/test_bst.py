@@ -114,6 +114,46 @@ class TestBST(unittest.TestCase):
             array = [key for key in tree]  # using out treesort
 
             self.assertEqual(array, sorted_array, 'In-Order traversal produces a wrong order: {0}'.format(array))
+
+    def testDegenerate(self):
+        # sorted keys build a chain far deeper than the recursion limit
+        tree = BinarySearchTree()
+        numbers = list(range(5000))
+        for num in numbers:
+            tree[num] = num
+        self.assertEqual(len(tree), 5000)
+        self.assertEqual(tree[4999], 4999)
+        self.assertEqual(tree.inorder_traversal(), numbers)
+        self.assertEqual(BinarySearchTree.treesort(numbers[::-1]), numbers)
+        with self.assertRaises(ValueError):
+            tree[17] = 17
+        for num in numbers[::2]:
+            del tree[num]
+        with self.assertRaises(ValueError):
+            del tree[0]
+        self.assertEqual(tree.inorder_traversal(), numbers[1::2])
+
+    def testLazyIterators(self):
+        random.seed(16)
+        numbers = random.sample(range(0, 400, 2), 120)
+        tree = BinarySearchTree()
+        for num in numbers:
+            tree[num] = str(num)
+        ascending = sorted(numbers)
+
+        self.assertEqual(list(tree.iter_items()), [(num, str(num)) for num in ascending])
+        self.assertEqual(list(reversed(tree)), ascending[::-1])
+        for lo, hi in [(None, 51), (51, None), (50, 150), (51, 149), (151, 150), (-10, 1000)]:
+            expected = [num for num in ascending if (lo is None or lo <= num) and (hi is None or num <= hi)]
+            self.assertEqual([key for key, _ in tree.iter_items(lo, hi)], expected)
+            self.assertEqual([key for key, _ in tree.iter_items(lo, hi, reverse=True)], expected[::-1])
+
+        # the key need not be in the tree, and the iterator can stop early
+        start = tree.iter_from(ascending[10] + 1)
+        self.assertEqual(next(start), (ascending[11], str(ascending[11])))
+        self.assertEqual(next(start)[0], ascending[12])
+        self.assertEqual([key for key, _ in tree.iter_from(ascending[10] + 1, reverse=True)], ascending[10::-1])
+        self.assertEqual(list(BinarySearchTree().iter_items()), [])
             
 unittest.main()
    #a = TestBST()
@@ -84,6 +84,33 @@ class TestGame(unittest.TestCase):
             g.simulate_day()
             g.finish_day()
     
+    def test_finish_day_matches_per_cave_rule(self):
+        RandomGen.set_seed(4321)
+        materials = [Material.random_material() for _ in range(10)]
+        caves = [Cave(f"Cave {i}", RandomGen.random_choice(materials), RandomGen.randint(0, 3)) for i in range(500)]
+        g = SoloGame()
+        g.set_materials(materials)
+        g.set_caves(caves)
+        expected = {}
+        for day in range(5):
+            RandomGen.set_seed(day)
+            for cave in g.get_caves():
+                quantity = cave.quantity
+                if quantity > 0 and RandomGen.random_chance(0.2):
+                    quantity -= RandomGen.random_float() * quantity
+                else:
+                    quantity += round(RandomGen.random_float() * 10, 2)
+                expected[cave.name] = round(quantity, 2)
+            expected_seed = RandomGen.seed
+
+            RandomGen.set_seed(day)
+            g.finish_day()
+            self.assertEqual(RandomGen.seed, expected_seed)
+            for cave in g.get_caves():
+                self.assertEqual(cave.quantity, expected[cave.name])
+            # some mining happens between days
+            g.get_caves()[day].remove_quantity(g.get_caves()[day].quantity)
+
     def test_unique(self):
         RandomGen.set_seed(1239087123)
         g = SoloGame()
@@ -95,6 +122,84 @@ class TestGame(unittest.TestCase):
         # and Traders
         self.assertEqual(len(set(map(lambda t: t.name, g.get_traders()))), len(g.get_traders()))
     
+    def test_select_for_players(self):
+        gold = Material("Gold Nugget", 27.24)
+        netherite = Material("Netherite Ingot", 20.95)
+        prismarine = Material("Prismarine Crystal", 11.48)
+        caves = [
+            Cave("Boulderfall Cave", prismarine, 10),
+            Cave("Castle Karstaag Ruins", netherite, 4),
+            Cave("Glacial Cave", gold, 3),
+            Cave("Orotheim", netherite, 4),
+            Cave("Red Eagle Redoubt", gold, 0.01),
+        ]
+        ruby = RandomTrader("Ruby Goodman")
+        ruby.add_material(netherite)
+        ruby.deal = (netherite, 8.54)
+        mable = RandomTrader("Mable Hodge")
+        mable.add_material(gold)
+        mable.deal = (gold, 6.7)
+        orson = RandomTrader("Orson Hoover")
+        orson.add_material(gold)
+        orson.deal = (gold, 4.87)
+
+        g = MultiplayerGame(sink=None)
+        g.initialise_with_data([gold, netherite, prismarine], caves, [ruby, mable, orson], ["Alex", "Steve", "Jo", "Ali"], [50, 50, 50, 50])
+        food = Food("Cabbage Seeds", 100, 10)
+        foods, balances, selected = g.select_for_players(food)
+
+        # both netherite caves are worth 4 * 8.54 - 10, and the one listed later is taken first
+        self.assertEqual([item[0].name if item else None for item in selected], ["Orotheim", "Castle Karstaag Ruins", "Glacial Cave", None])
+        self.assertEqual(foods, [food, food, food, None])
+        self.assertAlmostEqual(balances[0], 50 + 4 * 8.54 - 10)
+        self.assertAlmostEqual(balances[2], 50 + 3 * 6.7 - 10)
+        self.assertEqual(balances[3], 50)
+        self.assertAlmostEqual(selected[2][1], 3)
+
+        # Steve cannot afford the food, so the caves go to the players after him
+        g = MultiplayerGame(sink=None)
+        g.initialise_with_data([gold, netherite, prismarine], caves, [ruby, mable, orson], ["Alex", "Steve", "Jo", "Ali"], [50, 5, 50, 50])
+        foods, balances, selected = g.select_for_players(food)
+        self.assertEqual([item[0].name if item else None for item in selected], ["Orotheim", None, "Castle Karstaag Ruins", "Glacial Cave"])
+        self.assertEqual(foods, [food, None, food, food])
+        self.assertEqual(balances[1], 5)
+        g.verify_output_and_update_quantities(foods, balances, selected)
+
+    def test_verify_multiplayer(self):
+        gold = Material("Gold Nugget", 27.24)
+        netherite = Material("Netherite Ingot", 20.95)
+        caves = [
+            Cave("Castle Karstaag Ruins", netherite, 4),
+            Cave("Glacial Cave", gold, 3),
+        ]
+        ruby = RandomTrader("Ruby Goodman")
+        ruby.add_material(netherite)
+        ruby.deal = (netherite, 8.54)
+
+        g = MultiplayerGame(sink=None)
+        g.initialise_with_data([gold, netherite], caves, [ruby], ["Alex", "Steve", "Jo"], [50, 50, 4])
+        food = Food("Cabbage Seeds", 100, 5)
+
+        # each share fits in the cave, but the two of them do not
+        with self.assertRaises(AssertionError):
+            g.verify_output_and_update_quantities([food, food, None], [70.62, 70.62, 4], [(caves[0], 3), (caves[0], 3), None])
+        # gold cannot be sold
+        with self.assertRaises(AssertionError):
+            g.verify_output_and_update_quantities([food, None, None], [60, 50, 4], [(caves[1], 1), None, None])
+        # the balance is more than the netherite sells for
+        with self.assertRaises(AssertionError):
+            g.verify_output_and_update_quantities([food, None, None], [80, 50, 4], [(caves[0], 3), None, None])
+        # Jo cannot afford the food
+        with self.assertRaises(AssertionError):
+            g.verify_output_and_update_quantities([None, None, food], [50, 50, 7.54], [None, None, (caves[0], 1)])
+        self.assertEqual(caves[0].quantity, 4)
+        self.assertEqual([player.balance for player in g.players], [50, 50, 4])
+
+        g.verify_output_and_update_quantities([food, food, None], [70.62, 53.54, 4], [(caves[0], 3), (caves[0], 1), None])
+        self.assertEqual(caves[0].quantity, 0)
+        self.assertEqual(caves[1].quantity, 3)
+        self.assertEqual([player.balance for player in g.players], [70.62, 53.54, 4])
+
     def test_multiplayer(self):
         RandomGen.set_seed(1234)
         materials = [
@@ -2,7 +2,7 @@
 Tests basic functionality of the hash table methods, such as statistics.
 """
 
-from hash_table import LinearProbeTable
+from hash_table import LinearProbeTable, key_hash
 import unittest
 
 __author__ = "Jackson Goerner"
@@ -47,6 +47,96 @@ class TestHashTable(unittest.TestCase):
         self.assertGreaterEqual(probe_max, 3)    # Jon: 3  + Whatever rehash caused
         self.assertEqual(rehash, 1)              # 1 rehash
 
+    def test_key_hash(self):
+        for key in ["", "a", "Pierce Hodge", "Castle Karstaag Ruins", "H\u0334e\u0338r"]:
+            for tablesize in [2, 19, 101, 100003]:
+                position = 0
+                for index in range(len(key)):
+                    position = (position + ord(key[index]) * 29 ** index) % tablesize
+                self.assertEqual(key_hash(key) % tablesize, position)
+
+    def test_rehash_keeps_entries(self):
+        table = LinearProbeTable(2)
+        names = ["Cave {0}".format(i) for i in range(500)]
+        for name in names:
+            table[name] = name + "-value"
+        self.assertGreater(table.statistics()[3], 0)
+        for name in names:
+            self.assertEqual(table[name], name + "-value")
+        self.assertEqual(len(table), 500)
+
+    def test_delete(self):
+        table = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        for name in "Amy, Tim, Ann, Jim".split(", "):
+            table[name] = name + "-value"
+        # Amy, Tim and Ann share a chain; deleting Tim must not hide Ann
+        del table["Tim"]
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table["Ann"], "Ann-value")
+        self.assertNotIn("Tim", table)
+        self.assertRaises(KeyError, lambda: table["Tim"])
+        with self.assertRaises(KeyError):
+            del table["Tim"]
+        self.assertEqual(table.keys(), ["Amy", "Ann", "Jim"])
+
+        # Ann is already further along the chain, so it is updated in place
+        table["Ann"] = "Ann-new"
+        self.assertEqual(table.deleted_count, 1)
+        # a new key reuses the deleted slot
+        table["Tom"] = "Tom-value"
+        self.assertEqual(table.deleted_count, 0)
+        self.assertEqual(table.keys(), ["Amy", "Tom", "Ann", "Jim"])
+        self.assertEqual(table["Ann"], "Ann-new")
+
+    def test_delete_compacts(self):
+        table = LinearProbeTable(100)
+        names = ["Cave {0}".format(i) for i in range(100)]
+        for name in names:
+            table[name] = name
+        size = table.tableSize
+        for name in names[:90]:
+            del table[name]
+            self.assertLessEqual(table.deleted_count, LinearProbeTable.COMPACT_RATIO * size)
+        self.assertEqual(table.tableSize, size)
+        self.assertEqual(sorted(table.keys()), sorted(names[90:]))
+        for name in names[90:]:
+            self.assertEqual(table[name], name)
+
+        # compacting moves entries without counting towards the statistics
+        del table[names[90]]
+        statistics = table.statistics()
+        table._compact()
+        self.assertEqual(table.deleted_count, 0)
+        self.assertEqual(table.statistics(), statistics)
+
+    def test_from_items(self):
+        items = [("Cave {0}".format(i), i) for i in range(1000)] + [("Cave 7", -7)]
+        table = LinearProbeTable.from_items(items)
+        self.assertEqual(table.statistics()[3], 0, "Bulk build should not rehash.")
+        self.assertEqual(len(table), 1000)
+        self.assertEqual(table["Cave 999"], 999)
+        self.assertEqual(table["Cave 7"], -7)
+
+    def test_cached_views(self):
+        table = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        for name in "Eva, Amy, Tim".split(", "):
+            table[name] = name + "-value"
+        values = table.values()
+        self.assertEqual(values, ["Amy-value", "Tim-value", "Eva-value"])
+        self.assertIs(table.values(), values, "Unchanged table should return the cached list.")
+
+        table["Ron"] = "Ron-value"
+        self.assertIsNot(table.values(), values, "Cached list not invalidated by insertion.")
+        self.assertEqual(table.keys(), ["Ron", "Amy", "Tim", "Eva"])
+
+        for name in "Jan, Kim, Dot, Ann, Jim, Jon, Joe".split(", "):
+            table[name] = name + "-value"
+        # rehashing moves every entry, so the views must be rebuilt
+        self.assertEqual(len(table.values()), 11)
+        self.assertEqual(sorted(table.keys()), sorted("Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon, Joe".split(", ")))
+
 if __name__ == '__main__':
 
     # running all the tests
@@ -0,0 +1,92 @@
+from heap import MaxHeap, MinHeap, IndexedMaxHeap, IndexedMinHeap, nlargest, nsmallest
+from random_gen import RandomGen
+import unittest
+
+
+class TestHeap(unittest.TestCase):
+    """ Testing the growable heaps and top-k selection. """
+
+    def setUp(self):
+        RandomGen.set_seed(16)
+        self.numbers = [RandomGen.randint(0, 500) for _ in range(300)]
+
+    def drain(self, heap) -> list:
+        result = []
+        while len(heap) > 0:
+            result.append(heap.get_max())
+        return result
+
+    def test_grows(self):
+        heap = MaxHeap(1)
+        for number in self.numbers:
+            heap.add(number)
+        self.assertEqual(len(heap), 300)
+        self.assertEqual(self.drain(heap), sorted(self.numbers, reverse=True))
+        self.assertRaises(IndexError, heap.get_max)
+
+    def test_heapify(self):
+        for numbers in [[], [7], self.numbers]:
+            self.assertEqual(self.drain(MaxHeap.heapify(numbers)), sorted(numbers, reverse=True))
+            self.assertEqual(self.drain(MinHeap.heapify(iter(numbers))), sorted(numbers))
+
+    def test_key(self):
+        words = ["Netherite", "Gold", "Prismarine", "Coal", "Fishing Rod"]
+        heap = MinHeap.heapify(words, key=len)
+        self.assertEqual(heap.peek(), "Gold")
+        self.assertEqual(heap.replace_root("Diamond"), "Gold")
+        self.assertEqual([len(word) for word in self.drain(heap)], [4, 7, 9, 10, 11])
+
+    def test_nlargest(self):
+        for k in [0, 1, 10, 300, 400]:
+            self.assertEqual(nlargest(k, iter(self.numbers)), sorted(self.numbers, reverse=True)[:k])
+            self.assertEqual(nsmallest(k, self.numbers), sorted(self.numbers)[:k])
+        pairs = [(number, i) for i, number in enumerate(self.numbers)]
+        self.assertEqual(nlargest(5, pairs, key=lambda pair: (-pair[0], pair[1])), sorted(pairs, key=lambda pair: (pair[0], -pair[1]))[:5])
+
+    def test_indexed(self):
+        heap = IndexedMaxHeap()
+        handles = [heap.add(f"Cave {i}", self.numbers[i]) for i in range(len(self.numbers))]
+        for i in range(0, len(handles), 3):
+            self.numbers[i] = RandomGen.randint(0, 500)
+            heap.update(handles[i], self.numbers[i])
+        for i in range(1, len(handles), 7):
+            self.assertEqual(heap.remove(handles[i]), f"Cave {i}")
+        self.assertNotIn(handles[1], heap)
+        self.assertRaises(KeyError, lambda: heap.update(handles[1], 3))
+        self.assertEqual(heap.priority(handles[0]), self.numbers[0])
+
+        remaining = [(-self.numbers[i], i) for i in range(len(self.numbers)) if i % 7 != 1]
+        result = []
+        while len(heap) > 0:
+            result.append(heap.get_max())
+        # equal priorities leave in the order they were added
+        self.assertEqual(result, [f"Cave {i}" for _, i in sorted(remaining)])
+        self.assertRaises(IndexError, heap.peek)
+
+    def test_indexed_heapify(self):
+        heap = IndexedMaxHeap.heapify((f"Cave {i}", self.numbers[i]) for i in range(len(self.numbers)))
+        self.assertEqual(len(heap), len(self.numbers))
+        self.assertEqual(heap.element(7), "Cave 7")
+        heap.update(7, 1000)
+        self.assertEqual(heap.peek(), 7)
+        self.assertEqual(heap.remove(7), "Cave 7")
+        result = []
+        while len(heap) > 0:
+            result.append(heap.get_max())
+        self.assertEqual(result, [f"Cave {i}" for _, i in sorted((-self.numbers[i], i) for i in range(len(self.numbers)) if i != 7)])
+
+    def test_indexed_min(self):
+        heap = IndexedMinHeap()
+        first = heap.add("first", 2.5)
+        heap.add("second", 1.5)
+        heap.update(first, 0.5)
+        self.assertEqual(heap.element(heap.peek()), "first")
+        self.assertEqual([heap.get_min(), heap.get_min()], ["first", "second"])
+
+
+if __name__ == '__main__':
+    # seeding the pseudo-random generator
+    RandomGen.set_seed(16)
+
+    # running all the tests
+    unittest.main()
@@ -0,0 +1,93 @@
+from material_index import MaterialIndex
+from material import Material
+from cave import Cave
+from player import Player
+from trader import RandomTrader
+from random_gen import RandomGen
+import unittest
+
+
+class TestMaterialIndex(unittest.TestCase):
+    """ Testing the index of caves and deals by material. """
+
+    def setUp(self):
+        self.gold = Material("Gold Nugget", 27.24)
+        self.netherite = Material("Netherite Ingot", 20.95)
+        self.prismarine = Material("Prismarine Crystal", 11.48)
+        self.caves = [
+            Cave("Boulderfall Cave", self.prismarine, 10),
+            Cave("Glacial Cave", self.gold, 3),
+            Cave("Orotheim", self.prismarine, 6),
+        ]
+
+    def make_trader(self, name: str, material: Material, price: float) -> RandomTrader:
+        trader = RandomTrader(name)
+        trader.add_material(material)
+        trader.deal = (material, price)
+        return trader
+
+    def test_caves_for(self):
+        index = MaterialIndex.from_lists(self.caves, [])
+        self.assertEqual([cave.name for cave in index.caves_for(self.prismarine)], ["Boulderfall Cave", "Orotheim"])
+        self.assertEqual(index.caves_for(self.netherite), [])
+
+    def test_best_deal(self):
+        traders = [
+            self.make_trader("Orson Hoover", self.gold, 4.87),
+            self.make_trader("Mable Hodge", self.gold, 6.7),
+            self.make_trader("Ruby Goodman", self.netherite, 8.54),
+            RandomTrader("Lea Carpenter"),  # no deal
+        ]
+        index = MaterialIndex.from_lists(self.caves, traders)
+        self.assertEqual(index.best_deal(self.gold), (self.gold, 6.7))
+        self.assertIsNone(index.best_deal(self.prismarine))
+        self.assertTrue(index.is_sellable(self.netherite))
+        # netherite is bought, but is not in any cave
+        self.assertEqual(index.sellable_deals(), [(self.gold, 6.7)])
+
+        traders[1].deal = (self.gold, 2.5)
+        self.assertEqual(index.best_deal(self.gold), (self.gold, 4.87))
+        traders[3].add_material(self.prismarine)
+        traders[3].generate_deal()
+        self.assertTrue(index.is_sellable(self.prismarine))
+
+        # an index no longer holding a trader stops watching it
+        index.update_deals(traders[:1])
+        traders[2].stop_deal()
+        self.assertFalse(index.stale)
+        self.assertEqual(traders[2].watchers, [])
+
+    def test_player_index(self):
+        traders = [self.make_trader("Orson Hoover", self.gold, 4.87)]
+        shared = MaterialIndex.from_lists(self.caves, traders)
+        player = Player("Alex")
+        player.set_caves(self.caves)
+        player.set_traders(traders)
+        player.set_index(shared)
+        self.assertIs(player.material_index(), shared)
+
+        # a player with traders of its own builds its own index from them
+        own_traders = [self.make_trader("Ruby Goodman", self.prismarine, 8.54)]
+        player.set_traders(own_traders)
+        self.assertIsNot(player.material_index(), shared)
+        self.assertTrue(player.material_index().is_sellable(self.prismarine))
+        self.assertFalse(player.material_index().is_sellable(self.gold))
+        own_traders[0].deal = (self.prismarine, 9.1)
+        self.assertEqual(player.material_index().best_deal(self.prismarine), (self.prismarine, 9.1))
+
+        # setting the caves again drops the player's own index, which stops watching its traders
+        for _ in range(200):
+            player.set_caves(self.caves)
+            player.material_index()
+        self.assertEqual(len(own_traders[0].watchers), 1)
+        self.assertEqual(len(traders[0].watchers), 1)
+        player.set_traders(traders)
+        self.assertEqual(own_traders[0].watchers, [])
+
+
+if __name__ == '__main__':
+    # seeding the pseudo-random generator
+    RandomGen.set_seed(16)
+
+    # running all the tests
+    unittest.main()
@@ -0,0 +1,36 @@
+from monte_carlo import run_seasons, simulate_season
+from runner import MODE_SOLO, MODE_MULTIPLAYER
+from random_gen import RandomGen
+import unittest
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """ Testing seeded season simulation. """
+
+    def test_parallel_matches_serial(self):
+        for mode in [MODE_SOLO, MODE_MULTIPLAYER]:
+            with self.subTest(mode):
+                seeds = list(range(6))
+                serial = list(run_seasons(seeds, 30, mode, processes=1))
+                parallel = list(run_seasons(seeds, 30, mode, processes=3))
+                self.assertEqual([summary.seed for summary in parallel], seeds)
+                self.assertEqual(serial, parallel)
+
+    def test_order_independent(self):
+        # seasons reseed RandomGen, so running another season first makes no difference
+        first = simulate_season(5, 30)
+        simulate_season(9, 30)
+        self.assertEqual(simulate_season(5, 30), first)
+
+    def test_restores_random_state(self):
+        RandomGen.set_seed(77)
+        list(run_seasons([1, 2], 10, processes=1))
+        self.assertEqual(RandomGen.seed, 77)
+
+
+if __name__ == '__main__':
+    # seeding the pseudo-random generator
+    RandomGen.set_seed(16)
+
+    # running all the tests
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Tests the open addressing tables against the behaviour of LinearProbeTable.
+"""
+
+from open_addressing import PROBING_STRATEGIES, RobinHoodTable
+from cave import CAVE_NAMES
+from game import SoloGame
+from random_gen import RandomGen
+import unittest
+
+
+class TestOpenAddressing(unittest.TestCase):
+    """ Testing every probing strategy. """
+
+    def test_insert_get_delete(self):
+        names = ["Cave {0}".format(i) for i in range(500)] + CAVE_NAMES
+        for strategy, table_class in PROBING_STRATEGIES.items():
+            with self.subTest(strategy):
+                table = table_class(2)
+                for name in names:
+                    table[name] = name + "-value"
+                table["Cave 7"] = "replaced"
+                self.assertEqual(len(table), len(names))
+                self.assertEqual(table["Cave 7"], "replaced")
+                self.assertEqual(table["Cave 499"], "Cave 499-value")
+                self.assertNotIn("Cave 500", table)
+                self.assertEqual(len(table.statistics()), 4)
+                self.assertGreater(table.statistics()[3], 0)
+
+                for name in names[:400]:
+                    del table[name]
+                self.assertRaises(KeyError, lambda: table["Cave 0"])
+                with self.assertRaises(KeyError):
+                    del table["Cave 0"]
+                self.assertEqual(sorted(table.keys()), sorted(names[400:]))
+                for name in names[400:]:
+                    self.assertEqual(table[name], name + "-value")
+
+    def test_prime_tablesize(self):
+        for table_class in [PROBING_STRATEGIES["double"], PROBING_STRATEGIES["quadratic"]]:
+            with self.subTest(table_class.__name__):
+                self.assertRaises(ValueError, table_class, 10, 12)
+                table = table_class(10, 11)
+                for i in range(30):
+                    table["Cave {0}".format(i)] = i
+                self.assertEqual(table["Cave 29"], 29)
+
+    def test_robin_hood_order(self):
+        table = RobinHoodTable(300)
+        names = ["Cave {0}".format(i) for i in range(300)]
+        for i in range(len(names)):
+            table[names[i]] = i
+            if i % 3 == 0:
+                del table[names[i // 2]]
+        size = len(table.table)
+        for position in range(size):
+            entry = table.table[position]
+            following = table.table[(position + 1) % size]
+            if entry is not None and following is not None:
+                # a chain never moves an entry further from home than the entry before it, plus one
+                self.assertLessEqual(table._distance(following, (position + 1) % size, size), table._distance(entry, position, size) + 1)
+        self.assertEqual(table.deleted_count, 0)
+
+    def test_every_access_probes(self):
+        # telemetry times each table through _linear_probe, so every access has to go through it once
+        names = ["Cave {0}".format(i) for i in range(200)]
+        for strategy, table_class in PROBING_STRATEGIES.items():
+            with self.subTest(strategy):
+                table = table_class(2)
+                calls = []
+                probe = table._linear_probe
+                table._linear_probe = lambda key, is_insert: calls.append(key) or probe(key, is_insert)
+                for name in names:
+                    table[name] = name
+                for name in names[:50]:
+                    self.assertEqual(table[name], name)
+                    del table[name]
+                self.assertEqual(len(calls), 300)
+
+    def test_game_table_class(self):
+        class RobinHoodGame(SoloGame):
+            TABLE_CLASS = RobinHoodTable
+
+        RandomGen.set_seed(16)
+        game = RobinHoodGame(sink=None)
+        game.initialise_game()
+        self.assertIsInstance(game.caves_table, RobinHoodTable)
+        self.assertEqual(len(game.get_caves()), len(game.caves_table))
+        game.simulate_day()
+        game.finish_day()
+
+
+if __name__ == '__main__':
+    # seeding the pseudo-random generator
+    RandomGen.set_seed(16)
+
+    # running all the tests
+    unittest.main()
@@ -1,5 +1,9 @@
 from random_gen import RandomGen
 from player import Player
+from material import Material
+from cave import Cave
+from food import Food
+from trader import RandomTrader
 import unittest
 
 
@@ -16,6 +20,67 @@ class TestPlayer(unittest.TestCase):
         except Exception:
             raise AssertionError("Unable to instantiate player with correct inputs")
 
+    def make_player(self) -> Player:
+        RandomGen.set_seed(16)
+        gold = Material("Gold Nugget", 27.24)
+        netherite = Material("Netherite Ingot", 20.95)
+        fishing_rod = Material("Fishing Rod", 26.93)
+        prismarine = Material("Prismarine Crystal", 11.48)
+
+        traders = []
+        for name, material in [("Waldo Morgan", fishing_rod), ("Orson Hoover", gold), ("Lea Carpenter", prismarine), ("Ruby Goodman", netherite)]:
+            trader = RandomTrader(name)
+            trader.add_material(material)
+            trader.generate_deal()
+            traders.append(trader)
+
+        player = Player("Jackson", 50)
+        player.set_materials([gold, netherite, fishing_rod, prismarine])
+        player.set_caves([
+            Cave("Boulderfall Cave", prismarine, 10),
+            Cave("Castle Karstaag Ruins", netherite, 4),
+            Cave("Glacial Cave", gold, 3),
+            Cave("Orotheim", fishing_rod, 6),
+            Cave("Red Eagle Redoubt", fishing_rod, 3),
+        ])
+        player.set_traders(traders)
+        player.set_foods([
+            Food("Cabbage Seeds", 106, 30),
+            Food("Fried Rice", 129, 24),
+            Food("Cooked Chicken Cuts", 424, 19),
+        ])
+        return player
+
+    def test_strategies_agree(self):
+        player = self.make_player()
+        food, balance, caves = player.select_food_and_caves(Player.STRATEGY_HEAP)
+        sort_food, sort_balance, _ = player.select_food_and_caves(Player.STRATEGY_SORT)
+
+        self.assertIs(food, sort_food)
+        self.assertAlmostEqual(balance, sort_balance, places=4)
+        # every cave mined is reported, and no cave is mined past its quantity
+        self.assertEqual(len(caves), 4)
+        for cave, mined in caves:
+            self.assertLessEqual(mined, cave.quantity + 0.0001)
+        hunger_used = sum(mined * cave.material.mining_rate for cave, mined in caves)
+        self.assertAlmostEqual(hunger_used, food.hunger_bars, places=4)
+
+    def test_prefix_matches_heap(self):
+        player = self.make_player()
+        food, balance, caves = player.select_food_and_caves(Player.STRATEGY_HEAP)
+        prefix_food, prefix_balance, prefix_caves = player.select_food_and_caves(Player.STRATEGY_PREFIX)
+
+        self.assertIs(food, prefix_food)
+        self.assertAlmostEqual(balance, prefix_balance, places=6)
+        self.assertEqual([cave.name for cave, _ in caves], [cave.name for cave, _ in prefix_caves])
+        for (_, mined), (_, prefix_mined) in zip(caves, prefix_caves):
+            self.assertAlmostEqual(mined, prefix_mined, places=6)
+
+    def test_unknown_strategy(self):
+        player = self.make_player()
+        with self.assertRaises(ValueError):
+            player.select_food_and_caves("bogus")
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
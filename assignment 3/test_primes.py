@@ -0,0 +1,44 @@
+from primes import LargestPrimeIterator, is_prime, largest_prime_below
+from random_gen import RandomGen
+import unittest
+
+
+def trial_division_primes(upper_bound, factor, steps):
+    """ The sequence LargestPrimeIterator produced with trial division. """
+    highest_prime = 2
+    result = []
+    for _ in range(steps):
+        for number in range(highest_prime, upper_bound):
+            if all(number % divisor != 0 for divisor in range(2, number)):
+                highest_prime = number
+        upper_bound = highest_prime * factor
+        result.append(highest_prime)
+    return result
+
+
+class TestPrimes(unittest.TestCase):
+    """ Testing the prime table sizes. """
+
+    def test_is_prime(self):
+        small_primes = [n for n in range(2000) if n > 1 and all(n % d != 0 for d in range(2, n))]
+        self.assertEqual([n for n in range(2000) if is_prime(n)], small_primes)
+        self.assertTrue(is_prime(2 ** 61 - 1))
+        self.assertFalse(is_prime(3215031751))  # strong pseudoprime to bases 2, 3, 5 and 7
+
+    def test_same_sequence(self):
+        for upper_bound in [0, 1, 2, 3, 4, 30, 57, 58, 300, 1000]:
+            with self.subTest(upper_bound):
+                iterator = LargestPrimeIterator(upper_bound, 3)
+                self.assertEqual([next(iterator) for _ in range(3)], trial_division_primes(upper_bound, 3, 3))
+
+    def test_large_bound(self):
+        self.assertEqual(largest_prime_below(10 ** 6 * 3), 2999999)
+        self.assertEqual(next(LargestPrimeIterator(10 ** 6 * 3, 3)), 2999999)
+
+
+if __name__ == '__main__':
+    # seeding the pseudo-random generator
+    RandomGen.set_seed(16)
+
+    # running all the tests
+    unittest.main()
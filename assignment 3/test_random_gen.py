@@ -0,0 +1,63 @@
+from random_gen import RandomGen, RandomStream
+import unittest
+
+
+class TestRandomGen(unittest.TestCase):
+    """ Testing random streams against the global generator. """
+
+    def test_stream_matches_global(self):
+        RandomGen.set_seed(16)
+        expected = [RandomGen.randint(1, 10) for _ in range(50)] + [RandomGen.random_float() for _ in range(50)]
+        stream = RandomGen.stream(16)
+        actual = [stream.randint(1, 10) for _ in range(50)] + [stream.random_float() for _ in range(50)]
+        self.assertEqual(actual, expected)
+
+    def test_bulk_draws(self):
+        RandomGen.set_seed(1234)
+        expected_ints = [RandomGen.randint(-5, 30) for _ in range(100)]
+        expected_floats = [RandomGen.random_float() for _ in range(100)]
+        expected_randoms = [RandomGen.random() for _ in range(100)]
+        stream = RandomStream(1234)
+        self.assertEqual(list(stream.randints(100, -5, 30)), expected_ints)
+        self.assertEqual(list(stream.floats(100)), expected_floats)
+        self.assertEqual(list(stream.randoms(100)), expected_randoms)
+        self.assertEqual(stream.seed, RandomGen.seed)
+
+    def test_jump(self):
+        stream = RandomStream(99)
+        stream.randoms(12345)
+        self.assertEqual(RandomStream(99, 12345).random(), stream.random())
+        jumped = RandomStream(99)
+        jumped.jump(12346)
+        self.assertEqual(jumped.seed, stream.seed)
+
+    def test_skip(self):
+        RandomGen.set_seed(2022)
+        for _ in range(1000):
+            RandomGen.random()
+        expected = [RandomGen.random() for _ in range(5)]
+        RandomGen.set_seed(2022)
+        RandomGen.skip(1000)
+        self.assertEqual([RandomGen.random() for _ in range(5)], expected)
+
+        RandomGen.set_seed(2022)
+        RandomGen.skip(0)
+        RandomGen.skip(10 ** 12)
+        self.assertEqual(RandomGen.seed, RandomStream(2022, 10 ** 12).seed)
+        with self.assertRaises(ValueError):
+            RandomGen.skip(-1)
+
+    def test_streams_are_independent(self):
+        RandomGen.set_seed(7)
+        first = RandomGen.stream()
+        second = RandomGen.stream()
+        first.randoms(10)
+        self.assertEqual(second.random(), RandomGen.random())
+
+
+if __name__ == '__main__':
+    # seeding the pseudo-random generator
+    RandomGen.set_seed(16)
+
+    # running all the tests
+    unittest.main()
@@ -0,0 +1,43 @@
+from runner import run_headless, MODE_SOLO, MODE_MULTIPLAYER
+from game import print_sink
+from random_gen import RandomGen
+import contextlib
+import io
+import unittest
+
+
+class TestRunner(unittest.TestCase):
+    """ Testing headless simulation. """
+
+    def test_headless_is_silent(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            results = run_headless(1234, 20, MODE_SOLO)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual([result.day for result in results], list(range(20)))
+
+    def test_matches_printed_run(self):
+        for mode in [MODE_SOLO, MODE_MULTIPLAYER]:
+            with self.subTest(mode):
+                headless = run_headless(1234, 20, mode)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    printed = run_headless(1234, 20, mode, sink=print_sink)
+                self.assertEqual([result.balances for result in headless], [result.balances for result in printed])
+                self.assertEqual([result.quantity_mined for result in headless], [result.quantity_mined for result in printed])
+
+    def test_sink(self):
+        events = []
+        run_headless(16, 2, MODE_MULTIPLAYER, sink=lambda event, payload: events.append(event))
+        self.assertEqual(events, ["materials", "caves", "traders", "players", "deals", "foods", "deals", "foods"])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            run_headless(16, 1, "coop")
+
+
+if __name__ == '__main__':
+    # seeding the pseudo-random generator
+    RandomGen.set_seed(16)
+
+    # running all the tests
+    unittest.main()
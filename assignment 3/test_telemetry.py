@@ -0,0 +1,66 @@
+from telemetry import Telemetry, TableTimer, GAME_TABLES, EVENT_TABLE_ALERT
+from runner import run_headless, MODE_SOLO
+from hash_table import LinearProbeTable
+from random_gen import RandomGen
+import csv
+import os
+import tempfile
+import unittest
+
+
+class TestTelemetry(unittest.TestCase):
+    """ Testing the hash table telemetry. """
+
+    def test_snapshots(self):
+        telemetry = Telemetry(every=5)
+        plain = run_headless(1234, 20, MODE_SOLO)
+        results = run_headless(1234, 20, MODE_SOLO, telemetry=telemetry)
+        self.assertEqual([result.balances for result in results], [result.balances for result in plain])
+        self.assertEqual(len(telemetry.snapshots), 4 * len(GAME_TABLES))
+        self.assertEqual([snapshot.day for snapshot in telemetry.snapshots[::len(GAME_TABLES)]], [0, 5, 10, 15])
+        caves = [snapshot for snapshot in telemetry.snapshots if snapshot.table == "caves_table"]
+        self.assertGreaterEqual(caves[-1].probe_calls, caves[0].probe_calls)
+        for snapshot in caves:
+            self.assertLessEqual(snapshot.load_factor, 0.75)
+            self.assertEqual(snapshot.count, caves[0].count)
+        self.assertEqual(telemetry.alerts, [])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tables.csv")
+            telemetry.export_csv(path)
+            with open(path, newline="") as file:
+                rows = list(csv.reader(file))
+        self.assertEqual(rows[0][:3], ["day", "table", "count"])
+        self.assertEqual(len(rows), 1 + len(telemetry.snapshots))
+
+    def test_timer(self):
+        table = LinearProbeTable(10)
+        timer = TableTimer(table)
+        for i in range(100):
+            table["Cave {0}".format(i)] = i
+        self.assertEqual(timer.probe_calls, 100)
+        self.assertGreater(timer.rehash_seconds, 0)
+        timer.stop()
+        table["Cave 100"] = 100
+        self.assertEqual(timer.probe_calls, 100)
+        self.assertEqual(table["Cave 100"], 100)
+
+    def test_alert(self):
+        events = []
+        telemetry = Telemetry(max_probe_chain=0, max_mean_probes=0)
+        run_headless(1234, 3, MODE_SOLO, sink=lambda event, payload: events.append((event, payload)), telemetry=telemetry)
+        self.assertGreater(len(telemetry.alerts), 0)
+        alerts = [payload for event, payload in events if event == EVENT_TABLE_ALERT]
+        self.assertEqual(sum(len(payload) for payload in alerts), len(telemetry.alerts))
+
+    def test_interval(self):
+        with self.assertRaises(ValueError):
+            Telemetry(every=0)
+
+
+if __name__ == '__main__':
+    # seeding the pseudo-random generator
+    RandomGen.set_seed(16)
+
+    # running all the tests
+    unittest.main()
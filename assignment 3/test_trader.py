@@ -126,6 +126,54 @@ class TestTraders(unittest.TestCase):
         # check that the deal matches
         self.assertEqual(str(rando), "<HardTrader: Mr Barnes buying [Gunpowder: 8🍗/💎] for 2.01💰>", "Deal check failed")
 
+    def test_ordered_inventory(self):
+        RandomGen.set_seed(16)
+        materials = [Material("Clock", 6), Material("Emerald", 2), Material("Arrow", 6), Material("Ruby", 3), Material("Bow", 2)]
+        trader = RangeTrader("Mr Barnes")
+        trader.set_all_materials(materials)
+        trader.add_material(Material("Coal", 6))
+        # materials with the same mining rate keep the order they were added in
+        self.assertEqual([m.name for m in trader.materials_between(0, 5)], ["Emerald", "Bow", "Ruby", "Clock", "Arrow", "Coal"])
+        self.assertEqual([m.name for m in trader.materials_between(2, 3)], ["Ruby", "Clock"])
+        self.assertEqual(trader.materials_between(6, 8), [])
+
+        # generating deals sorts the given list in place
+        trader.generate_deal()
+        self.assertEqual([m.name for m in materials], ["Emerald", "Bow", "Ruby", "Clock", "Arrow", "Coal"])
+
+        hard = HardTrader("Dana Rowland")
+        hard.set_all_materials(materials[:5])
+        hard.generate_deal()
+        self.assertEqual(hard.current_deal()[0].name, "Arrow")
+        self.assertEqual([m.name for m in hard.sort_inventory()], ["Emerald", "Bow", "Ruby", "Clock", "Arrow"])
+
+    def test_shared_inventory(self):
+        RandomGen.set_seed(16)
+        materials = [Material("Clock", 6), Material("Emerald", 2), Material("Arrow", 6), Material("Ruby", 3), Material("Bow", 2)]
+        rando = RandomTrader("Ruby Goodman")
+        rando.set_all_materials(materials)
+        ranger = RangeTrader("Mr Barnes")
+        ranger.set_all_materials(materials)
+        deals = []
+        for _ in range(4):
+            rando.generate_deal()
+            ranger.generate_deal()
+            deals.append((rando.deal[0].name, rando.deal[1], ranger.deal[0].name, ranger.deal[1]))
+
+        # once the range trader sorts the shared list, the random trader draws from the sorted order
+        self.assertEqual(deals, [("Arrow", 7.57, "Ruby", 5.65), ("Clock", 8.54, "Arrow", 5.46),
+                                 ("Emerald", 8.59, "Clock", 8.5), ("Arrow", 4.56, "Ruby", 8.83)])
+        self.assertEqual([m.name for m in materials], ["Emerald", "Bow", "Ruby", "Clock", "Arrow"])
+
+        # a material added by one trader sharing the list is sold by the others too
+        hard = HardTrader("Dana Rowland")
+        hard.set_all_materials(materials)
+        ranger.add_material(Material("Coal", 9))
+        hard.generate_deal()
+        self.assertEqual(hard.current_deal()[0].name, "Coal")
+        self.assertEqual([m.name for m in hard.sort_inventory()], ["Emerald", "Bow", "Ruby", "Clock", "Arrow", "Coal"])
+        self.assertEqual([m.name for m in ranger.materials_between(4, 5)], ["Arrow", "Coal"])
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from abc import abstractmethod, ABC
+from avl import AVLTree
 from material import Material
 from random_gen import RandomGen
 
@@ -85,7 +86,52 @@ class Trader(ABC):
 
         self.name = name
         self.inventory = []
+        self.ordered_inventory = AVLTree()
+        self.inventory_sorted = False
+        self.watchers = []
         self.deal = None
+
+    @property
+    def deal(self) -> tuple[Material, float] | None:
+        """
+        The (material, price) deal the trader is offering, or None
+
+        Worst case complexity: O(1)
+        Best Case complexity: O(1)
+        """
+        return self._deal
+
+    @deal.setter
+    def deal(self, deal: tuple[Material, float] | None) -> None:
+        """
+        Sets the deal, and tells every watcher of the trader that its deal has changed
+
+        Worst case complexity: O(W) where W is the number of watchers
+        Best Case complexity: O(1) nothing is watching the trader
+        """
+        self._deal = deal
+        for watcher in self.watchers:
+            watcher.deals_changed()
+
+    def watch(self, watcher) -> None:
+        """
+        Registers an object whose deals_changed() method is called every time the deal changes
+
+        Worst case complexity: O(W) where W is the number of watchers
+        Best Case complexity: O(1)
+        """
+        if watcher not in self.watchers:
+            self.watchers.append(watcher)
+
+    def unwatch(self, watcher) -> None:
+        """
+        Stops telling a watcher about new deals
+
+        Worst case complexity: O(W) where W is the number of watchers
+        Best Case complexity: O(1)
+        """
+        if watcher in self.watchers:
+            self.watchers.remove(watcher)
         
     @classmethod
     def random_trader(cls):
@@ -108,21 +154,39 @@ class Trader(ABC):
             return HardTrader(TRADER_NAMES[RandomGen.randint(0,len(TRADER_NAMES)-1)])
             
     def set_all_materials(self, mats: list[Material]) -> None:
+        """
+        Replaces the trader inventory, and orders it by mining rate
+
+        Parameters:
+                mats(list[Material]): materials to sell, which may be shared with other traders
+        Returns:
+                None
+
+        Worst case complexity: O(N log N) where N is the number of materials
+        Best Case complexity: O(N log N) where N is the number of materials
+        """
         self.inventory = mats
+        self.inventory_sorted = False
+        self.ordered_inventory = AVLTree()
+        for position in range(len(mats)):
+            self.ordered_inventory[(mats[position].mining_rate, position)] = mats[position]
     
     def add_material(self, mat: Material) -> None:
         """
-        Adds the materials to the trader inventory
+        Adds the materials to the trader inventory, and to the inventory ordered by mining rate
 
         Parameters:
                 mat(Material): material to be added
         Returns:
                 None
 
-        Worst case complexity: O(1)
-        Best Case complexity: O(1)
+        Worst case complexity: O(log N) where N is the number of materials
+        Best Case complexity: O(log N) where N is the number of materials
         """
+        # materials with the same mining rate stay in the order they were added
+        self.ordered_inventory[(mat.mining_rate, len(self.inventory))] = mat
         self.inventory.append(mat)
+        self.inventory_sorted = False
     
     def is_currently_selling(self) -> bool:
         """
@@ -185,16 +249,46 @@ class Trader(ABC):
         return f"<{self.__name__()}: {self.name} {dealString}>"
 
     def sort_inventory(self):
-        list = self.inventory
-        n = len(list)
-        for mark in range(1,n):
-            temp = list[mark]
-            i = mark - 1
-            while i >= 0 and list[i].mining_rate > temp.mining_rate:
-                list[i+1] = list[i]
-                i -= 1
-            list[i+1] = temp
-        return list
+        """
+        Sorts the inventory in place by mining rate, keeping materials with the same mining
+        rate in the order they were added
+
+        Returns:
+                the sorted inventory
+
+        Worst case complexity: O(N log N) where N is the number of materials, another trader sharing
+        the inventory added to it
+        Best Case complexity: O(N) where N is the number of materials
+        """
+        self.sync_inventory()
+        self.inventory[:] = self.ordered_inventory.inorder_traversal()
+        self.inventory_sorted = True
+        return self.inventory
+
+    def keep_inventory_sorted(self) -> None:
+        """
+        Sorts the inventory in place the first time it is needed after it was set or added to.
+        The list may be shared with other traders, and a RandomTrader draws from it by position,
+        so it has to end up sorted just as if it were re-sorted on every deal.
+
+        Worst case complexity: O(N log N) where N is the number of materials, another trader sharing
+        the inventory added to it
+        Best Case complexity: O(1) the inventory is already sorted
+        """
+        self.sync_inventory()
+        if not self.inventory_sorted:
+            self.sort_inventory()
+
+    def sync_inventory(self) -> None:
+        """
+        Rebuilds the inventory ordered by mining rate from the inventory list when their sizes differ,
+        which happens when another trader sharing the list adds a material to it
+
+        Worst case complexity: O(N log N) where N is the number of materials, the sizes differ
+        Best Case complexity: O(1) the sizes match
+        """
+        if len(self.ordered_inventory) != len(self.inventory):
+            self.set_all_materials(self.inventory)
 
 class RandomTrader(Trader):
 
@@ -226,17 +320,18 @@ class RangeTrader(Trader):
 
     def generate_deal(self) -> None:
         """
-        Creates and sets a deal by generating a list of all materials which are easy to mine, choose a random material and buy price
+        Creates and sets a deal by choosing a random range of the materials ordered by how easy they are
+        to mine, then a random material in that range and a random buy price
 
-        Worst case complexity: O(1)
-        Best Case complexity: O(1)
+        Worst case complexity: O(N log N) where N is the number of materials, the first deal after
+        another trader sharing the inventory added to it, and O(log N) once it is sorted
+        Best Case complexity: O(1) the inventory is empty
         """
-        n = self.sort_inventory()
+        self.keep_inventory_sorted()
         if len(self.inventory) > 0:
-            i = RandomGen.randint(0, len(self.inventory)-1)
-            j = RandomGen.randint(i, len(self.inventory)-1)
-            materialsInRange = n[i:j+1]
-            item = materialsInRange[RandomGen.randint(0,max(len(materialsInRange)-1,0))]
+            i = RandomGen.randint(0, len(self.ordered_inventory)-1)
+            j = RandomGen.randint(i, len(self.ordered_inventory)-1)
+            item = self.ordered_inventory.kth(i + RandomGen.randint(0, j - i))
             price =  round(2 + 8 * RandomGen.random_float(), 2)
             self.deal = (item,price)
    
@@ -250,11 +345,12 @@ class RangeTrader(Trader):
         Returns:
                 inventory list of materials
 
-        Worst case complexity:
-        Best Case complexity:
+        Worst case complexity: O(j - i + log N) where N is the number of materials, plus O(N log N) the first
+        time after another trader sharing the inventory added to it
+        Best Case complexity: O(1) the range is empty
         """
-        self.sort_inventory() #idk what we're doing to sort the list by mining difficulty
-        return self.inventory[i:j+1]
+        self.keep_inventory_sorted()
+        return self.ordered_inventory.items_between(i, j)
 
 
 class HardTrader(Trader):
@@ -266,10 +362,17 @@ class HardTrader(Trader):
         return str("HardTrader")
 
     def generate_deal(self) -> None:
+        """
+        Creates and sets a deal for the hardest material to mine, at a random buy price
+
+        Worst case complexity: O(N log N) where N is the number of materials, the first deal after
+        another trader sharing the inventory added to it, and O(log N) once it is sorted
+        Best Case complexity: O(1) the inventory is empty
+        """
+        self.keep_inventory_sorted()
         if len(self.inventory) > 0:
             price =  round(2 + 8 * RandomGen.random_float(), 2)
-            self.sort_inventory()
-            item = (self.inventory)[-1]
+            item = self.ordered_inventory.kth(len(self.ordered_inventory) - 1)
             self.deal = (item,price)
         else:
             return None